@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CommunityConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "community"
+
+    def ready(self):
+        from utils.query_observer_utils import install_execute_wrapper
+
+        # Before any connection is opened, so that every one gets the wrapper.
+        connection_created.connect(install_execute_wrapper)
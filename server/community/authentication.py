@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.models import TokenUser
+
+from utils.timing_utils import timed
+
+if TYPE_CHECKING:
+    from community.models import User
+
+
+class ClaimsUser(TokenUser):
+    """A user built from the claims that `TokenSerializer` puts in the token.
+
+    Used with `JWTTokenUserAuthentication` to authenticate requests without
+    loading the user row. Views that need the row can use `user_model`, which
+    loads it on first access.
+    """
+
+    @cached_property
+    def first_name(self) -> str:
+        return self.token.get("first_name", "")
+
+    @cached_property
+    def last_name(self) -> str:
+        return self.token.get("last_name", "")
+
+    @cached_property
+    def email(self) -> str:
+        return self.token.get("email", "")
+
+    @cached_property
+    def date_joined(self) -> Optional[datetime]:
+        date_joined = self.token.get("date_joined")
+        return datetime.fromisoformat(date_joined) if date_joined else None
+
+    @cached_property
+    def version(self) -> Optional[int]:
+        return self.token.get("version")
+
+    @cached_property
+    def user_model(self) -> "User":
+        return get_user_model().objects.get(pk=self.id)
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    @timed("authenticate")
+    def authenticate(self, request):
+        return super().authenticate(request)
+
+
+class JWTTokenUserAuthentication(authentication.JWTTokenUserAuthentication):
+    @timed("authenticate")
+    def authenticate(self, request):
+        return super().authenticate(request)
@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from community.services.password_hashing_service import password_hashing_service
+
+
+class PooledHashingModelBackend(ModelBackend):
+    """`ModelBackend` that verifies passwords in the password hashing pool."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway to reduce the timing difference between an
+            # existing and a nonexistent user.
+            password_hashing_service.make_password(password)
+        else:
+            if password_hashing_service.check_password(
+                user, password
+            ) and self.user_can_authenticate(user):
+                return user
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class CalibratedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 with the iteration count from `PASSWORD_HASHER_ITERATIONS`.
+
+    Use `manage.py calibrate_password_hasher` to pick the value for the target
+    hardware. Existing hashes are upgraded on the next successful login when
+    the value changes.
+    """
+
+    @property
+    def iterations(self) -> int:
+        return settings.PASSWORD_HASHER_ITERATIONS
@@ -0,0 +1,384 @@
+import json
+import platform
+import random
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from community.models import EmailAddress
+from community.services import user_service
+from community.views.authorization_views import LogInView, SignUpView
+from community.views.user_views import GetMeView, UserViewSet
+from utils.benchmark_utils import BenchmarkResult, compare_results, measure
+
+SCENARIOS = [
+    "sign_up",
+    "log_in",
+    "get_me",
+    "user_list",
+    "user_get",
+    "user_update",
+    "user_partial_update",
+    "user_delete",
+    "user_search_prefix",
+    "user_search_fuzzy",
+]
+
+SEEDED_USERNAME_PREFIX = "bench_"
+PASSWORD = "benchmark-Passw0rd"
+# Seeded names are made of these, so that searches match realistic fractions of
+# the users.
+NAME_SYLLABLES = (
+    "an ar bel che da do el fi ga geo ha is jo ka ki la li ma mi na ni o pa pe "
+    "ra ri sa so ta te th to va vi xa ya ze zo"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the community API views against a throwaway database seeded "
+        "with each --sizes number of users. Prints p50/p95/p99 latency, "
+        "requests per second, queries per request and peak memory, writes them "
+        "to --output and compares them with --baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000]
+        )
+        parser.add_argument(
+            "--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS
+        )
+        parser.add_argument("--requests", type=int, default=100)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--memory-requests",
+            type=int,
+            default=10,
+            help="Requests to run under tracemalloc after the timed ones.",
+        )
+        parser.add_argument("--output", default="benchmark-results.json")
+        parser.add_argument(
+            "--baseline", help="Results of a previous run to compare against."
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.2,
+            help="Allowed p95 growth against the baseline, as a fraction.",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the benchmark database, and its seeded users, between runs.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.factory = APIRequestFactory()
+        self.random = random.Random(options["seed"])
+
+        # A database of its own, so that benchmarks never touch real data and
+        # can run next to the test suite.
+        old_name = connection.settings_dict["NAME"]
+        connection.settings_dict["TEST"]["NAME"] = f"benchmark_{old_name}"
+        setup_test_environment()
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            # Every request comes from the same address and users.
+            with override_settings(THROTTLE_RATES={}):
+                results = self.run_benchmarks()
+            environment = self.get_environment()
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+        with open(options["output"], "w") as f:
+            json.dump(
+                {"environment": environment, "results": results},
+                f,
+                indent=2,
+            )
+        self.stderr.write(f"Results written to {options['output']}.")
+
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)["results"]
+
+            regressions = compare_results(results, baseline, options["max_regression"])
+            if regressions:
+                raise CommandError("\n".join(["Regressions found:", *regressions]))
+
+            self.stderr.write("No regressions against the baseline.")
+
+    def run_benchmarks(self) -> list[BenchmarkResult]:
+        self.admin = self.get_or_create_user("benchadmin", is_staff=True)
+        self.member = self.get_or_create_user("benchmember")
+        self.member_access_token = user_service.create_access_token(self.member)[
+            "access"
+        ]
+        self.password_hash = make_password(PASSWORD)
+
+        self.stdout.write(
+            f"{'scenario':<22}{'users':>10}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'p99 ms':>10}{'req/s':>10}{'queries':>9}{'peak KiB':>10}"
+        )
+
+        results = []
+        for size in sorted(self.options["sizes"]):
+            self.seed_users(size)
+
+            for scenario in self.options["scenarios"]:
+                user_service.profile_cache.clear()
+                result = measure(
+                    scenario,
+                    size,
+                    self.get_prepare(scenario),
+                    self.options["requests"],
+                    self.options["warmup"],
+                    self.options["memory_requests"],
+                )
+                results.append(result)
+                self.stdout.write(
+                    f"{scenario:<22}{size:>10}{result['p50_ms']:>10}"
+                    f"{result['p95_ms']:>10}{result['p99_ms']:>10}"
+                    f"{result['requests_per_second']:>10}"
+                    f"{result['queries_per_request']:>9}"
+                    f"{result['peak_memory_kib']:>10}"
+                )
+
+        return results
+
+    def get_or_create_user(self, username: str, is_staff: bool = False):
+        user_model = get_user_model().objects.filter(username=username).first()
+        if user_model is None:
+            user_model, _ = user_service.create_user(
+                safe_username=username,
+                unsafe_password=PASSWORD,
+                safe_email=f"{username}@example.com",
+                safe_terms_of_service=True,
+            )
+
+        user_model.is_staff = user_model.is_superuser = is_staff
+        user_model.save(update_fields=["is_staff", "is_superuser"])
+        return user_model
+
+    def seed_users(self, size: int, batch_size: int = 10_000) -> None:
+        """Top the seeded users up to `size`, half of them with a verified
+        email address."""
+
+        missing = (
+            size
+            - get_user_model()
+            .objects.filter(username__startswith=SEEDED_USERNAME_PREFIX)
+            .count()
+        )
+
+        while missing > 0:
+            user_models = []
+            for _ in range(min(missing, batch_size)):
+                username = f"{SEEDED_USERNAME_PREFIX}{uuid.uuid4().hex}"
+                user_models.append(
+                    get_user_model()(
+                        username=username,
+                        email=f"{username}@example.com",
+                        password=self.password_hash,
+                        first_name=self.get_name(2),
+                        last_name=self.get_name(4),
+                    )
+                )
+
+            get_user_model().objects.bulk_create(user_models)
+            EmailAddress.objects.bulk_create(
+                EmailAddress(
+                    user_model=user_model,
+                    email=user_model.email,
+                    is_primary=True,
+                    is_verified=i % 2 == 0,
+                )
+                for i, user_model in enumerate(user_models)
+            )
+            missing -= len(user_models)
+
+    def get_name(self, max_syllables: int) -> str:
+        syllable_count = self.random.randint(2, max_syllables)
+        return "".join(self.random.choices(NAME_SYLLABLES, k=syllable_count)).title()
+
+    def get_seeded_user_ids(self, count: int) -> list[int]:
+        """Return `count` random seeded user ids, picked with an index scan
+        each so that sampling stays cheap with millions of users."""
+
+        seeded_users = get_user_model().objects.filter(
+            username__startswith=SEEDED_USERNAME_PREFIX
+        )
+        id_range = seeded_users.order_by("id").values_list("id", flat=True)
+        low, high = id_range.first(), id_range.last()
+
+        return [
+            id_range.filter(id__gte=self.random.randint(low, high)).first()
+            for _ in range(count)
+        ]
+
+    def get_prepare(self, scenario: str) -> Callable[[int], Callable[[], None]]:
+        total_requests = sum(
+            self.options[option] for option in ("warmup", "requests", "memory_requests")
+        )
+
+        if scenario == "sign_up":
+            view = SignUpView.as_view()
+
+            def make_request(i):
+                username = f"signup_{uuid.uuid4().hex}"
+                request = self.factory.post(
+                    "/api/sign-up/",
+                    data={
+                        "username": username,
+                        "email": f"{username}@example.com",
+                        "password": PASSWORD,
+                        "terms_of_service": True,
+                        "first_name": "Josh",
+                    },
+                    format="json",
+                )
+                return view, request, {}, 201
+
+        elif scenario == "log_in":
+            view = LogInView.as_view()
+
+            def make_request(i):
+                request = self.factory.post(
+                    "/api/token/",
+                    data={"username": self.member.username, "password": PASSWORD},
+                    format="json",
+                )
+                return view, request, {}, 200
+
+        elif scenario == "get_me":
+            view = GetMeView.as_view()
+
+            def make_request(i):
+                request = self.factory.get(
+                    "/api/users/me/",
+                    HTTP_AUTHORIZATION=f"Bearer {self.member_access_token}",
+                )
+                return view, request, {}, 200
+
+        elif scenario == "user_list":
+            view = UserViewSet.as_view({"get": "list"})
+
+            def make_request(i):
+                request = self.factory.get("/api/users/", {"is_verified": "true"})
+                force_authenticate(request, self.admin)
+                return view, request, {}, 200
+
+        elif scenario == "user_get":
+            view = UserViewSet.as_view({"get": "get"})
+            user_ids = self.get_seeded_user_ids(total_requests)
+
+            def make_request(i):
+                request = self.factory.get(f"/api/users/{user_ids[i]}/")
+                force_authenticate(request, self.member)
+                return view, request, {"pk": user_ids[i]}, 200
+
+        elif scenario in ("user_update", "user_partial_update"):
+            method = "put" if scenario == "user_update" else "patch"
+            action = "update" if scenario == "user_update" else "partial_update"
+            view = UserViewSet.as_view({method: action})
+            user_ids = self.get_seeded_user_ids(total_requests)
+
+            def make_request(i):
+                request = getattr(self.factory, method)(
+                    f"/api/users/{user_ids[i]}/",
+                    data={"first_name": f"Bench{i}", "last_name": "Updated"},
+                    format="json",
+                )
+                force_authenticate(request, self.admin)
+                return view, request, {"pk": user_ids[i]}, 204
+
+        elif scenario == "user_delete":
+            view = UserViewSet.as_view({"delete": "delete"})
+            user_ids = list(
+                get_user_model()
+                .objects.filter(username__startswith=SEEDED_USERNAME_PREFIX)
+                .order_by("-id")
+                .values_list("id", flat=True)[:total_requests]
+            )
+
+            def make_request(i):
+                request = self.factory.delete(f"/api/users/{user_ids[i]}/")
+                force_authenticate(request, self.admin)
+                return view, request, {"pk": user_ids[i]}, 204
+
+        elif scenario in ("user_search_prefix", "user_search_fuzzy"):
+            view = UserViewSet.as_view({"get": "search"})
+            last_names = list(
+                get_user_model()
+                .objects.filter(id__in=self.get_seeded_user_ids(total_requests))
+                .values_list("last_name", flat=True)
+            )
+            queries = [
+                # What has been typed so far, or the name with a typo.
+                last_names[i % len(last_names)][:4]
+                if scenario == "user_search_prefix"
+                else last_names[i % len(last_names)][:-1] + "x"
+                for i in range(total_requests)
+            ]
+            mode = scenario.removeprefix("user_search_")
+
+            def make_request(i):
+                request = self.factory.get(
+                    "/api/users/search/", {"q": queries[i], "mode": mode}
+                )
+                force_authenticate(request, self.member)
+                return view, request, {}, 200
+
+        else:
+            raise CommandError(f"Unknown scenario {scenario}.")
+
+        def prepare(i):
+            view, request, kwargs, expected_status = make_request(i)
+
+            def send():
+                response = view(request, **kwargs)
+                response.render()
+
+                if response.status_code != expected_status:
+                    raise CommandError(
+                        f"{scenario} returned {response.status_code} instead of "
+                        f"{expected_status}: {response.content[:200]!r}"
+                    )
+
+            return send
+
+        return prepare
+
+    def get_environment(self) -> dict[str, Any]:
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "database_version": connection.pg_version
+            if connection.vendor == "postgresql"
+            else None,
+            "password_hasher_iterations": settings.PASSWORD_HASHER_ITERATIONS,
+            "requests": self.options["requests"],
+        }
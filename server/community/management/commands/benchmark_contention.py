@@ -0,0 +1,154 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from community.services import user_service
+from errors import domain_errors
+from utils.benchmark_utils import get_percentiles
+
+MODES = ["locking", "optimistic"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent read-modify-write profile updates on a few hot users, "
+        "either holding a row lock between the read and the write (locking) or "
+        "with a compare-and-swap on the profile version that retries on "
+        "conflict (optimistic). Runs against a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--updates", type=int, default=200, help="Per thread.")
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=1,
+            help="Users the updates are spread over; fewer means more contention.",
+        )
+        parser.add_argument(
+            "--think-ms",
+            type=float,
+            default=1.0,
+            help="Time spent between reading the profile and writing it back.",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+
+        old_name = connection.settings_dict["NAME"]
+        connection.settings_dict["TEST"]["NAME"] = f"benchmark_{old_name}"
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user_ids = self.create_users(options["users"])
+
+            self.stdout.write(
+                f"{'mode':<12}{'updates/s':>11}{'p50 ms':>10}{'p95 ms':>10}"
+                f"{'p99 ms':>10}{'retries':>9}"
+            )
+            for mode in options["modes"]:
+                self.run_mode(mode, user_ids)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def create_users(self, count: int) -> list[int]:
+        return [
+            user_service.create_user(
+                safe_username=f"contention{i}",
+                unsafe_password="benchmark-Passw0rd",
+                safe_email=f"contention{i}@example.com",
+                safe_terms_of_service=True,
+            )[0].id
+            for i in range(count)
+        ]
+
+    def run_mode(self, mode: str, user_ids: list[int]) -> None:
+        update = self.update_locking if mode == "locking" else self.update_optimistic
+        latencies: list[float] = []
+        retries = [0]
+        lock = threading.Lock()
+        barrier = threading.Barrier(self.options["threads"])
+
+        def work(thread_index: int) -> None:
+            thread_latencies = []
+            thread_retries = 0
+            barrier.wait()
+
+            try:
+                for i in range(self.options["updates"]):
+                    user_id = user_ids[(thread_index + i) % len(user_ids)]
+                    start = time.perf_counter()
+                    thread_retries += update(user_id, f"T{thread_index}U{i}")
+                    thread_latencies.append(time.perf_counter() - start)
+            finally:
+                connections.close_all()
+
+            with lock:
+                latencies.extend(thread_latencies)
+                retries[0] += thread_retries
+
+        threads = [
+            threading.Thread(target=work, args=(i,))
+            for i in range(self.options["threads"])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        percentiles = get_percentiles(latencies)
+        self.stdout.write(
+            f"{mode:<12}{len(latencies) / elapsed:>11.1f}"
+            f"{percentiles[50] * 1000:>10.2f}{percentiles[95] * 1000:>10.2f}"
+            f"{percentiles[99] * 1000:>10.2f}{retries[0]:>9}"
+        )
+
+    def think(self) -> None:
+        time.sleep(self.options["think_ms"] / 1000)
+
+    def update_locking(self, user_id: int, first_name: str) -> int:
+        """Read the profile under a row lock and write it back."""
+
+        with transaction.atomic():
+            get_user_model().objects.select_for_update().filter(id=user_id).values(
+                "first_name", "version"
+            ).get()
+            self.think()
+            get_user_model().objects.filter(id=user_id).update(
+                first_name=first_name, version=F("version") + 1
+            )
+
+        return 0
+
+    def update_optimistic(self, user_id: int, first_name: str) -> int:
+        """Read the profile and write it back unless it changed in between,
+        starting over when it did. Returns the number of retries."""
+
+        retries = 0
+
+        while True:
+            version = (
+                get_user_model()
+                .objects.filter(id=user_id)
+                .values_list("version", flat=True)
+                .get()
+            )
+            self.think()
+            try:
+                user_service.update_user_profile_by_id(
+                    user_id, safe_first_name=first_name, expected_versions=[version]
+                )
+            except domain_errors.ProfileVersionConflictError:
+                retries += 1
+            else:
+                return retries
@@ -0,0 +1,54 @@
+import statistics
+import time
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher
+from django.core.management.base import BaseCommand, CommandError
+
+PROBE_ITERATIONS = 100_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the preferred password hasher on this machine and print the "
+        "PASSWORD_HASHER_ITERATIONS value that makes one hash take --target-ms."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target-ms", type=float, default=250.0)
+        parser.add_argument("--samples", type=int, default=5)
+
+    def handle(self, *args, **options):
+        hasher = get_hasher()
+        if not isinstance(hasher, PBKDF2PasswordHasher):
+            raise CommandError(
+                f"Calibration is only supported for PBKDF2 hashers, the preferred "
+                f"hasher is {hasher.algorithm}."
+            )
+
+        seconds_per_iteration = (
+            self._measure(hasher, PROBE_ITERATIONS, options["samples"])
+            / PROBE_ITERATIONS
+        )
+        iterations = max(
+            1000, int(round(options["target_ms"] / 1000 / seconds_per_iteration, -3))
+        )
+        latency = self._measure(hasher, iterations, options["samples"])
+
+        self.stderr.write(
+            f"One {hasher.algorithm} hash with {iterations} iterations takes "
+            f"{latency * 1000:.1f}ms on this machine "
+            f"(current setting: {hasher.iterations})."
+        )
+        self.stdout.write(f"PASSWORD_HASHER_ITERATIONS={iterations}")
+
+    def _measure(self, hasher, iterations, samples):
+        """Return the median duration in seconds of one hash."""
+
+        durations = []
+        for _ in range(samples):
+            salt = hasher.salt()
+            start = time.perf_counter()
+            hasher.encode("calibration-password", salt, iterations)
+            durations.append(time.perf_counter() - start)
+
+        return statistics.median(durations)
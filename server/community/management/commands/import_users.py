@@ -0,0 +1,68 @@
+import json
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from community.services import user_service
+from community.services.user_service import BulkCreationResult
+from utils.error_utils import get_record_error
+from utils.import_utils import RECORD_FORMATS, RecordParseError, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users in batches from a JSON, CSV or NDJSON file. Errors are "
+        "written to stdout as one JSON object per line."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - to read stdin.")
+        parser.add_argument(
+            "--format",
+            choices=RECORD_FORMATS,
+            help="Record format. Defaults to the file extension.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        record_format = options["format"] or Path(path).suffix.lstrip(".").lower()
+
+        if record_format not in RECORD_FORMATS:
+            raise CommandError("Could not infer the format, use --format.")
+
+        if path == "-":
+            result = self._import(sys.stdin, record_format, options["batch_size"])
+        else:
+            with open(path, newline="", encoding="utf-8") as stream:
+                result = self._import(stream, record_format, options["batch_size"])
+
+        self._report(result)
+
+    def _import(self, stream, record_format, batch_size):
+        result: BulkCreationResult = {"created_count": 0, "errors": []}
+
+        try:
+            return user_service.bulk_create_users(
+                read_records(stream, record_format),
+                batch_size=batch_size,
+                result=result,
+            )
+        except RecordParseError as e:
+            # The batches read before the error are already committed.
+            self._report(result)
+            raise CommandError(
+                f"Could not parse {record_format.upper()}: {e}. The "
+                f"{result['created_count']} users created before the error "
+                f"were kept."
+            )
+
+    def _report(self, result):
+        for index, e in sorted(result["errors"], key=lambda error: error[0]):
+            self.stdout.write(json.dumps(get_record_error(index, e)))
+
+        self.stderr.write(
+            f"Created {result['created_count']} users, "
+            f"{len(result['errors'])} records failed."
+        )
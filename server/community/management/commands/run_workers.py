@@ -0,0 +1,76 @@
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from community.services import job_service
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the job table with --concurrency worker "
+        "threads, until interrupted or, with --burst, until no job is due."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOB_POLL_INTERVAL_SECONDS,
+            help="Seconds to wait before looking again when no job is due.",
+        )
+        parser.add_argument(
+            "--burst", action="store_true", help="Exit once no job is due."
+        )
+
+    def handle(self, *args, **options):
+        stopping = threading.Event()
+
+        def stop(signum, frame):
+            self.stderr.write("Stopping once the running jobs are done.")
+            stopping.set()
+
+        previous_handlers = {
+            signum: signal.signal(signum, stop)
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+
+        def work():
+            try:
+                while not stopping.is_set():
+                    try:
+                        if job_service.run_next():
+                            continue
+                    except Exception:
+                        # Most likely a lost connection, which the next
+                        # query reopens.
+                        logger.exception("Could not fetch the next job.")
+                        connections.close_all()
+                    else:
+                        if options["burst"]:
+                            break
+
+                    stopping.wait(options["poll_interval"])
+            finally:
+                connections.close_all()
+
+        workers = [
+            threading.Thread(target=work, name=f"worker-{i}")
+            for i in range(options["concurrency"])
+        ]
+        try:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from community.models import EmailAddress
+from community.services import email_verification_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Send a fresh verification email to every unverified address of a user "
+        "that was not deleted, in batches of --batch-size over one connection "
+        "each. Tokens are not stored, so earlier ones stay valid until they "
+        "expire."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--primary-only",
+            action="store_true",
+            help="Only the primary addresses, that users signed up with.",
+        )
+
+    def handle(self, *args, **options):
+        email_address_queryset = EmailAddress.objects.filter(
+            is_verified=False, user_model__deleted_at__isnull=True
+        )
+        if options["primary_only"]:
+            email_address_queryset = email_address_queryset.filter(is_primary=True)
+
+        sent_count = 0
+        last_id = 0
+
+        # Keyset pagination, so that every batch is an index range scan.
+        while True:
+            email_address_models = list(
+                email_address_queryset.filter(id__gt=last_id)
+                .only("id", "user_model_id", "email", "normalized_email")
+                .order_by("id")[: options["batch_size"]]
+            )
+            if not email_address_models:
+                break
+
+            sent_count += email_verification_service.send_verification_emails(
+                email_address_models
+            )
+            last_id = email_address_models[-1].id
+
+        self.stderr.write(f"Sent {sent_count} verification emails.")
@@ -0,0 +1,51 @@
+from django.db import migrations, models
+import community.models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("community", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emailaddress",
+            name="normalized_email",
+            field=community.models.NormalizedEmailField(
+                editable=False, max_length=254, null=True
+            ),
+        ),
+        migrations.RunSQL(
+            "UPDATE community_emailaddress SET normalized_email = LOWER(TRIM(email))",
+            migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name="emailaddress",
+            name="normalized_email",
+            field=community.models.NormalizedEmailField(
+                editable=False, max_length=254, unique=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="emailaddress",
+            name="email",
+            field=models.EmailField(max_length=254),
+        ),
+        migrations.AddIndex(
+            model_name="emailaddress",
+            index=models.Index(
+                condition=models.Q(("is_verified", True)),
+                fields=["user_model"],
+                name="community_email_verified_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="community_user_email_lower_idx",
+            ),
+        ),
+    ]
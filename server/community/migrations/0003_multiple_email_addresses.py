@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("community", "0002_normalized_email"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="emailaddress",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="emailaddress",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_primary", True)),
+                fields=("user_model",),
+                name="community_email_one_primary_per_user",
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+def check_trigram_extension_is_available(apps, schema_editor):
+    # Without this, CREATE EXTENSION fails with "could not open extension
+    # control file", which does not say what to install.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            raise RuntimeError(
+                "The user search needs the pg_trgm extension, which this "
+                "PostgreSQL server does not provide. Install the PostgreSQL "
+                "contrib package on the server (the official postgres images "
+                "include it), then run the migrations again."
+            )
+
+
+class Migration(migrations.Migration):
+    # Building the indexes concurrently keeps sign-ups and updates going on
+    # large tables, and can not run in a transaction.
+    atomic = False
+
+    dependencies = [
+        ("community", "0003_multiple_email_addresses"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            check_trigram_extension_is_available, migrations.RunPython.noop
+        ),
+        # Installs pg_trgm if it is not installed yet, which needs the
+        # CREATE privilege on the database.
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower("username"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_username_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower("first_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_first_name_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Lower("last_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_last_name_trgm_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("community", "0004_user_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,34 @@
+import django.contrib.auth.models
+from django.db import migrations, models
+
+import community.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("community", "0006_job"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", community.models.UserManager()),
+                ("all_objects", django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at"],
+                name="community_user_deleted_idx",
+            ),
+        ),
+    ]
@@ -1,15 +1,88 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as BaseUserManager
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+# The user fields that the user search matches, each with a trigram index.
+USER_SEARCH_FIELDS = ("username", "first_name", "last_name")
+
+
+def normalize_email_address(email: str) -> str:
+    """Return the form of `email` that is compared for uniqueness and lookups."""
+
+    return email.strip().lower()
+
+
+class NormalizedEmailField(models.EmailField):
+    """Normalized copy of another email field of the model, set on every save.
+
+    It is filled in `pre_save`, which `save()` and `bulk_create()` both call, so
+    it can not drift from its source. `QuerySet.update()` must set both fields.
+    """
+
+    def __init__(self, *args, source_field: str = "email", **kwargs) -> None:
+        self.source_field = source_field
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.source_field != "email":
+            kwargs["source_field"] = self.source_field
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = normalize_email_address(getattr(model_instance, self.source_field))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class UserManager(BaseUserManager):
+    """The users that were not deleted."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class User(AbstractUser):
-    pass
+    # Bumped by every change to the profile, and used as its ETag.
+    version = models.PositiveIntegerField(default=1)
+    # Deleted users are hidden by `objects` until a job purges them, see
+    # `UserService.purge_deleted_users`. Their usernames stay taken until then.
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = UserManager()
+    all_objects = BaseUserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Finds the users that signed up with an email address, whatever
+            # its case.
+            models.Index(Lower("email"), name="community_user_email_lower_idx"),
+            # Serve both the prefix (LIKE) and the fuzzy (%) user searches.
+            *(
+                GinIndex(
+                    OpClass(Lower(field), name="gin_trgm_ops"),
+                    name=f"user_{field}_trgm_idx",
+                )
+                for field in USER_SEARCH_FIELDS
+            ),
+            # Finds the users left to purge.
+            models.Index(
+                fields=["deleted_at"],
+                condition=models.Q(deleted_at__isnull=False),
+                name="community_user_deleted_idx",
+            ),
+        ]
 
 
 class EmailAddress(models.Model):
     user_model = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
-    email = models.EmailField(unique=True)
+    email = models.EmailField()
+    normalized_email = NormalizedEmailField(unique=True)
     is_verified = models.BooleanField(default=False)
     is_primary = models.BooleanField(default=False)
 
@@ -17,4 +90,50 @@ class EmailAddress(models.Model):
         return str(self.email)
 
     class Meta:
-        unique_together = (("user_model", "is_primary"),)
+        constraints = [
+            # Any number of secondary addresses, but one primary per user. The
+            # index also serves batched lookups of primary addresses.
+            models.UniqueConstraint(
+                fields=["user_model"],
+                condition=models.Q(is_primary=True),
+                name="community_email_one_primary_per_user",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user_model"],
+                condition=models.Q(is_verified=True),
+                name="community_email_verified_idx",
+            ),
+        ]
+
+
+class Job(models.Model):
+    """Work to run outside of the request, see `JobService`."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        FAILED = "failed"
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.status})"
+
+    class Meta:
+        indexes = [
+            # Workers only ever look for pending jobs that are due.
+            models.Index(
+                fields=["run_at"],
+                condition=models.Q(status="pending"),
+                name="community_job_pending_idx",
+            ),
+        ]
@@ -1,4 +1,6 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import EXCLUDE, Schema, fields, pre_load, validate
+
+from community.schemas.compiled_validators import CompiledValidator
 
 
 class BaseUserSchema(Schema):
@@ -40,3 +42,47 @@ class UserCreationValidator(BaseUserSchema):
 
 class UserUpdateValidator(BaseUserSchema):
     ...
+
+
+class EmailAddressValidator(Schema):
+    email = fields.Email(required=True, load_only=True)
+
+
+class UserListFilterValidator(Schema):
+    is_active = fields.Boolean(required=False, load_only=True)
+    is_staff = fields.Boolean(required=False, load_only=True)
+    is_verified = fields.Boolean(required=False, load_only=True)
+
+
+class UserSearchValidator(Schema):
+    # Shorter queries have no trigram to look up in the indexes, and would
+    # rank the whole table.
+    q = fields.Str(
+        required=True,
+        load_only=True,
+        validate=[
+            validate.Length(3, 150, error="Query must be 3 to 150 characters long.")
+        ],
+    )
+    mode = fields.Str(
+        load_default="fuzzy",
+        load_only=True,
+        validate=[validate.OneOf(["prefix", "fuzzy"])],
+    )
+
+    @pre_load
+    def strip_query(self, data, **kwargs):
+        # Stripped before the length is checked, so blank queries are rejected.
+        if isinstance(data.get("q"), str):
+            # Query dicts keep lists of values, so they are copied by key.
+            data = {key: data.get(key) for key in data}
+            data["q"] = data["q"].strip()
+
+        return data
+
+
+user_creation_validator = CompiledValidator(UserCreationValidator)
+user_update_validator = CompiledValidator(UserUpdateValidator, partial=True)
+email_address_validator = CompiledValidator(EmailAddressValidator)
+user_list_filter_validator = CompiledValidator(UserListFilterValidator, unknown=EXCLUDE)
+user_search_validator = CompiledValidator(UserSearchValidator, unknown=EXCLUDE)
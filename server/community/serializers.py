@@ -26,4 +26,12 @@ class TokenSerializer(TokenObtainPairSerializer):
         for key, value in user_data.items():
             if key != "id":
                 token[key] = value
+
+        # Claims read by `ClaimsUser`, so requests can be authenticated
+        # without loading the user.
+        token["email"] = user.email
+        token["date_joined"] = user.date_joined.isoformat()
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        token["version"] = user.version
         return token
@@ -1 +1,5 @@
+from .job_service import job_service  # noqa
+from .email_verification_service import email_verification_service  # noqa
 from .user_service import user_service  # noqa
+from .password_hashing_service import password_hashing_service  # noqa
+from .username_availability_service import username_availability_service  # noqa
@@ -0,0 +1,112 @@
+import hashlib
+from typing import Iterable
+
+from django.conf import settings
+from django.core import mail, signing
+from django.db.models.functions import MD5, Left
+
+from community.models import EmailAddress, normalize_email_address
+from community.services.job_service import job_service
+from errors import domain_errors
+
+# Hex digits of the MD5 of the normalized address kept in a token. The digest
+# only tells whether the address changed, the signature protects the token, and
+# MD5 is built into PostgreSQL where SHA-256 needs pgcrypto.
+DIGEST_LENGTH = 16
+
+
+class EmailVerificationService:
+    """Verifies email addresses with signed, expiring tokens, so that nothing
+    is stored per token.
+
+    A token carries the id of the address, the id of its user and a digest of
+    the normalized address, and is signed with `SECRET_KEY` and timestamped.
+    It is accepted for `EMAIL_VERIFICATION_MAX_AGE_SECONDS`, and only while
+    the address still belongs to the same user and is spelled the same: the
+    single UPDATE that verifies the address is conditioned on all three, so an
+    address claimed by another user meanwhile is not verified for them.
+    """
+
+    salt = "community.email-verification"
+
+    def __init__(self) -> None:
+        job_service.register("send_verification_email", self.send_verification_email)
+
+    def make_token(self, email_address_model: EmailAddress) -> str:
+        return signing.dumps(
+            {
+                "id": email_address_model.id,
+                "user": email_address_model.user_model_id,
+                "digest": self.get_digest(email_address_model.normalized_email),
+            },
+            salt=self.salt,
+            compress=True,
+        )
+
+    def get_digest(self, normalized_email: str) -> str:
+        return hashlib.md5(
+            normalized_email.encode(), usedforsecurity=False
+        ).hexdigest()[:DIGEST_LENGTH]
+
+    def verify(self, token: str) -> None:
+        try:
+            payload = signing.loads(
+                token,
+                salt=self.salt,
+                max_age=settings.EMAIL_VERIFICATION_MAX_AGE_SECONDS,
+            )
+        except signing.BadSignature as e:
+            raise domain_errors.InvalidEmailVerificationTokenError() from e
+
+        # The digest is compared in the database, so that checking the token
+        # and verifying the address is one statement.
+        verified_count = (
+            EmailAddress.objects.alias(
+                digest=Left(MD5("normalized_email"), DIGEST_LENGTH)
+            )
+            .filter(
+                id=payload["id"],
+                user_model_id=payload["user"],
+                digest=payload["digest"],
+            )
+            .update(is_verified=True)
+        )
+
+        if not verified_count:
+            raise domain_errors.InvalidEmailVerificationTokenError()
+
+    def get_message(self, email_address_model: EmailAddress) -> mail.EmailMessage:
+        url = settings.EMAIL_VERIFICATION_URL.format(
+            token=self.make_token(email_address_model)
+        )
+
+        return mail.EmailMessage(
+            subject="Verify your email address",
+            body=f"Open the following link to verify your email address:\n\n{url}\n",
+            to=[email_address_model.email],
+        )
+
+    def send_verification_emails(
+        self, email_address_models: Iterable[EmailAddress]
+    ) -> int:
+        """Send a fresh token to each address over one connection, returning
+        how many were sent."""
+
+        with mail.get_connection() as connection:
+            return connection.send_messages(
+                [self.get_message(model) for model in email_address_models]
+            )
+
+    def send_verification_email(self, user_id: int, email: str) -> None:
+        # Runs as a job, after sign-up or after an address is added. Nothing is
+        # sent when the address was verified or claimed by someone else since.
+        email_address_models = EmailAddress.objects.filter(
+            user_model_id=user_id,
+            normalized_email=normalize_email_address(email),
+            is_verified=False,
+        )
+
+        self.send_verification_emails(email_address_models)
+
+
+email_verification_service = EmailVerificationService()
@@ -0,0 +1,121 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from community.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """A job queue kept in the `Job` table and run by `manage.py run_workers`.
+
+    Jobs are enqueued in the transaction of the request that needs them, so
+    they exist if and only if that transaction commits. A worker claims a job
+    with ``SELECT ... FOR UPDATE SKIP LOCKED`` and runs it in the same
+    transaction, then deletes it: a worker that dies mid-job releases the lock
+    and the job runs again, so handlers must be idempotent.
+
+    A failing job is retried with exponential backoff up to `JOB_MAX_ATTEMPTS`
+    times, and then kept as failed for inspection.
+    """
+
+    def __init__(self) -> None:
+        self.handlers: dict[str, Callable[..., None]] = {}
+
+    def register(self, name: str, handler: Callable[..., None]) -> None:
+        self.handlers[name] = handler
+
+    def enqueue(
+        self, name: str, *, delay: float = 0, deduplicate: bool = False, **payload: Any
+    ) -> Optional[Job]:
+        """Enqueue a job to run in `delay` seconds at the earliest.
+
+        With `deduplicate`, which needs a transaction, nothing is enqueued and
+        None is returned while the same job is already waiting to run. Jobs
+        that workers are running do not count, so that whatever was written
+        during the run gets a job of its own. Concurrent calls may still both
+        enqueue the job.
+        """
+
+        if name not in self.handlers:
+            raise ValueError(f"No handler is registered for job {name}.")
+
+        if deduplicate:
+            # Running jobs are locked by their worker, and skipped.
+            waiting_job = (
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(name=name, payload=payload, status=Job.Status.PENDING)
+                .first()
+            )
+            if waiting_job is not None:
+                return None
+
+        return Job.objects.create(
+            name=name,
+            payload=payload,
+            run_at=timezone.now() + timedelta(seconds=delay),
+        )
+
+    def run_next(self) -> bool:
+        """Run the next due job, returning whether there was one."""
+
+        with transaction.atomic():
+            job = (
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(status=Job.Status.PENDING, run_at__lte=timezone.now())
+                .order_by("run_at")
+                .first()
+            )
+            if job is None:
+                return False
+
+            try:
+                with transaction.atomic():
+                    self.handlers[job.name](**job.payload)
+            except Exception:
+                logger.exception("Job %s %s failed.", job.id, job.name)
+                self._retry_later(job, traceback.format_exc())
+            else:
+                job.delete()
+
+        return True
+
+    def run_pending(self) -> int:
+        """Run jobs until none is due, returning how many ran."""
+
+        count = 0
+        while self.run_next():
+            count += 1
+
+        return count
+
+    def get_retry_delay(self, attempts: int) -> float:
+        delay = min(
+            settings.JOB_RETRY_MAX_SECONDS,
+            settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        )
+        # Jitter keeps jobs that failed together from retrying together.
+        return delay * random.uniform(0.5, 1)
+
+    def _retry_later(self, job: Job, error: str) -> None:
+        job.attempts += 1
+        job.last_error = error
+
+        if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+            job.status = Job.Status.FAILED
+        else:
+            job.run_at = timezone.now() + timedelta(
+                seconds=self.get_retry_delay(job.attempts)
+            )
+
+        job.save(update_fields=["attempts", "last_error", "status", "run_at"])
+
+
+job_service = JobService()
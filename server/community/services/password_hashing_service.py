@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+
+from errors import domain_errors
+from utils.metrics_utils import PASSWORD_HASH_DURATION
+from utils.timing_utils import timed
+
+if TYPE_CHECKING:
+    from community.models import User
+
+
+def _init_worker() -> None:
+    # Worker processes started with "spawn" need their own app registry.
+    django.setup()
+
+
+def _make_password(unsafe_password: str) -> str:
+    return hashers.make_password(unsafe_password)
+
+
+def _verify_password(unsafe_password: str, encoded: str) -> bool:
+    return hashers.check_password(unsafe_password, encoded)
+
+
+class PasswordHashingService:
+    """Runs password hashing and verification in a bounded worker pool.
+
+    `PASSWORD_HASHING_POOL` picks a thread pool (hashlib releases the GIL while
+    hashing) or a process pool. At most `PASSWORD_HASHING_MAX_WORKERS` hashes run
+    at once and `PASSWORD_HASHING_MAX_QUEUE_DEPTH` more may wait. Requests
+    beyond that fail fast with `ServiceOverloadedError` instead of piling up.
+
+    Batch hashing has its own `PASSWORD_HASHING_BULK_MAX_WORKERS` slots, and
+    waits for them: an import neither takes the slots of log-ins and sign-ups
+    nor queues more than that many hashes ahead of them.
+    """
+
+    def __init__(self) -> None:
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._bulk_slots: Optional[threading.BoundedSemaphore] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                max_workers = settings.PASSWORD_HASHING_MAX_WORKERS
+
+                if settings.PASSWORD_HASHING_POOL == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=max_workers, initializer=_init_worker
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max_workers, thread_name_prefix="password"
+                    )
+
+                self._slots = threading.BoundedSemaphore(
+                    max_workers + settings.PASSWORD_HASHING_MAX_QUEUE_DEPTH
+                )
+                self._bulk_slots = threading.BoundedSemaphore(
+                    settings.PASSWORD_HASHING_BULK_MAX_WORKERS
+                )
+
+        return self._executor
+
+    def _submit(
+        self, func: Callable[..., Any], *args: Any, bulk: bool = False
+    ) -> Future:
+        executor = self._get_executor()
+        slots = self._bulk_slots if bulk else self._slots
+
+        # Batch callers wait for a slot, interactive ones fail fast.
+        if not slots.acquire(blocking=bulk):
+            raise domain_errors.ServiceOverloadedError()
+
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            slots.release()
+            raise
+
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    @timed("hash")
+    def make_password(self, unsafe_password: str) -> str:
+        with PASSWORD_HASH_DURATION.labels("make").time():
+            return self._submit(_make_password, unsafe_password).result()
+
+    @timed("hash")
+    async def amake_password(self, unsafe_password: str) -> str:
+        with PASSWORD_HASH_DURATION.labels("make").time():
+            return await asyncio.wrap_future(
+                self._submit(_make_password, unsafe_password)
+            )
+
+    @timed("hash")
+    def make_passwords(self, unsafe_passwords: Iterable[str]) -> list[str]:
+        """Hash many passwords in parallel on the batch slots, waiting for
+        them rather than failing, since batch callers are not latency
+        sensitive."""
+
+        futures = [
+            self._submit(_make_password, unsafe_password, bulk=True)
+            for unsafe_password in unsafe_passwords
+        ]
+        return [future.result() for future in futures]
+
+    def check_password(self, user_model: "User", unsafe_password: str) -> bool:
+        """Pooled equivalent of `User.check_password`, including upgrading the
+        stored hash when the preferred hasher or its cost changed."""
+
+        encoded = user_model.password
+        with timed("hash"), PASSWORD_HASH_DURATION.labels("check").time():
+            is_correct = self._submit(
+                _verify_password, unsafe_password, encoded
+            ).result()
+
+        if is_correct and self._must_update(encoded):
+            try:
+                user_model.password = self.make_password(unsafe_password)
+            except domain_errors.ServiceOverloadedError:
+                # The password is correct: upgrade its hash on a later log-in
+                # rather than fail this one.
+                return is_correct
+
+            user_model.save(update_fields=["password"])
+
+        return is_correct
+
+    def _must_update(self, encoded: str) -> bool:
+        preferred = hashers.get_hasher()
+        try:
+            hasher = hashers.identify_hasher(encoded)
+        except ValueError:
+            return False
+
+        return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+password_hashing_service = PasswordHashingService()
@@ -1,13 +1,40 @@
-from typing import TYPE_CHECKING, TypedDict, Any
+import itertools
+from typing import TYPE_CHECKING, Any, Iterable, Optional, TypedDict, Union
 
+import marshmallow
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction
-from rest_framework_simplejwt.tokens import RefreshToken
-
-
-from community.models import EmailAddress
-from community.schemas.user_validators import UserCreationValidator, UserUpdateValidator
+from django.core.cache import caches
+from django.db import IntegrityError, connection, transaction
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Exists, F, OuterRef, Q, QuerySet
+from django.db.models.functions import Greatest, Lower
+from django.utils import timezone
+
+
+from community.models import (
+    USER_SEARCH_FIELDS,
+    EmailAddress,
+    normalize_email_address,
+)
+from community.schemas.user_validators import (
+    email_address_validator,
+    user_creation_validator,
+    user_list_filter_validator,
+    user_search_validator,
+    user_update_validator,
+)
+from community.serializers import TokenSerializer
+from community.services.job_service import job_service
+from community.services.password_hashing_service import password_hashing_service
+from community.services.username_availability_service import (
+    username_availability_service,
+)
 from errors import domain_errors
+from utils.deletion_utils import get_cascade_delete_sql
+from utils.sanitization_utils import strip_xss
+from utils.timing_utils import timed
 
 if TYPE_CHECKING:
     from community.models import User
@@ -18,36 +45,213 @@ class TokenResponse(TypedDict):
     access: str
 
 
+# The version of a profile, and the profile.
+VersionedProfile = tuple[int, dict[str, Any]]
+
+
+class BulkCreationResult(TypedDict):
+    created_count: int
+    errors: list[tuple[int, Union[marshmallow.ValidationError, domain_errors.Error]]]
+
+
+class ProfileCache:
+    """Read-through cache of serialized user profiles and their versions.
+
+    Entries live in the `profiles` cache alias, whose backend, TTL and maximum
+    number of entries are configured in `CACHES`. The service invalidates them
+    explicitly whenever a profile changes.
+    """
+
+    def __init__(self, alias: str = "profiles") -> None:
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_key(self, user_id: int) -> str:
+        return f"user-profile:{user_id}"
+
+    def get(self, user_id: int) -> Optional[VersionedProfile]:
+        versioned_profile = self.cache.get(self.get_key(user_id))
+
+        if versioned_profile is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return versioned_profile
+
+    def set(self, user_id: int, versioned_profile: VersionedProfile) -> None:
+        self.cache.set(self.get_key(user_id), versioned_profile)
+
+    def delete(self, *user_ids: int) -> None:
+        self.cache.delete_many([self.get_key(user_id) for user_id in user_ids])
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
 class UserService:
-    def update_or_create_email_address(
-        self, user_model: "User", email: str, is_primary: bool, is_verified: bool
-    ) -> None:
+    def __init__(self) -> None:
+        self.profile_cache = ProfileCache()
+
+        job_service.register(
+            "remove_other_users_with_email", self._remove_other_users_with_email
+        )
+        job_service.register("purge_deleted_users", self.purge_deleted_users)
+
+    def get_email_address(self, email_address_model: EmailAddress) -> dict[str, Any]:
+        return {
+            "id": email_address_model.id,
+            "email": email_address_model.email,
+            "is_verified": email_address_model.is_verified,
+            "is_primary": email_address_model.is_primary,
+        }
+
+    def get_email_addresses(self, user_id: int) -> list[dict[str, Any]]:
+        """Return the addresses of a user, primary first, in one indexed query.
+
+        Users created without an address, by `createsuperuser` or before
+        addresses were kept apart, have none; only then is a second query
+        needed, to tell them from users that do not exist.
+        """
+
+        email_address_models = EmailAddress.objects.filter(
+            user_model_id=user_id
+        ).order_by("-is_primary", "id")
+        if not email_address_models and not self.does_user_exists(user_id):
+            raise domain_errors.UserDoesNotExistsError()
+
+        return [self.get_email_address(model) for model in email_address_models]
+
+    def get_primary_email_addresses(self, user_ids: Iterable[int]) -> dict[int, str]:
+        """Return the primary address of each user, keyed by user id, in one
+        query served by the partial unique index on primary addresses."""
+
+        return dict(
+            EmailAddress.objects.filter(
+                user_model_id__in=list(user_ids), is_primary=True
+            ).values_list("user_model_id", "email")
+        )
+
+    def add_email_address(self, user_id: int, safe_email: str) -> dict[str, Any]:
+        """Add an unverified, secondary address to a user."""
+
+        email_address_validator.load({"email": safe_email})
+
+        if not self.does_user_exists(user_id):
+            raise domain_errors.UserDoesNotExistsError()
+
+        email_address_model = EmailAddress(user_model_id=user_id, email=safe_email)
+        try:
+            with transaction.atomic():
+                email_address_model.save(force_insert=True)
+                job_service.enqueue(
+                    "send_verification_email", email=safe_email, user_id=user_id
+                )
+        except IntegrityError as e:
+            raise domain_errors.EmailAddressAlreadyExistsError() from e
+
+        return self.get_email_address(email_address_model)
+
+    def verify_email_address(self, user_id: int, email_address_id: int) -> None:
+        verified_count = EmailAddress.objects.filter(
+            id=email_address_id, user_model_id=user_id
+        ).update(is_verified=True)
+
+        if not verified_count:
+            raise domain_errors.EmailAddressDoesNotExistError()
+
+    def set_primary_email_address(self, user_id: int, email_address_id: int) -> None:
+        """Make a verified address the primary one, and the email of the user."""
+
         with transaction.atomic():
+            # Locking every address of the user serializes concurrent promotions,
+            # which would otherwise collide on the one-primary constraint.
+            email_address_models = list(
+                EmailAddress.objects.select_for_update().filter(user_model_id=user_id)
+            )
+            target = next(
+                (
+                    model
+                    for model in email_address_models
+                    if model.id == email_address_id
+                ),
+                None,
+            )
 
-            (
-                email_address_model,
-                _,
-            ) = EmailAddress.objects.select_for_update().get_or_create(
-                email=email, defaults={"user_model": user_model}
+            if target is None:
+                raise domain_errors.EmailAddressDoesNotExistError()
+            if not target.is_verified:
+                raise domain_errors.EmailAddressNotVerifiedError()
+            if target.is_primary:
+                return
+
+            EmailAddress.objects.filter(user_model_id=user_id, is_primary=True).update(
+                is_primary=False
+            )
+            EmailAddress.objects.filter(id=target.id).update(is_primary=True)
+            get_user_model().objects.filter(id=user_id).update(
+                email=target.email, version=F("version") + 1
             )
 
-            if (
-                email_address_model.is_verified
-                and email_address_model.user_model.id != user_model.id
-            ):
-                raise domain_errors.EmailAddressAlreadyExistsError()
+        self.profile_cache.delete(user_id)
+
+    def remove_email_address(self, user_id: int, email_address_id: int) -> None:
+        deleted_count, _ = EmailAddress.objects.filter(
+            id=email_address_id, user_model_id=user_id, is_primary=False
+        ).delete()
+
+        if deleted_count:
+            return
+
+        if EmailAddress.objects.filter(
+            id=email_address_id, user_model_id=user_id
+        ).exists():
+            raise domain_errors.CannotRemovePrimaryEmailAddressError()
+
+        raise domain_errors.EmailAddressDoesNotExistError()
+
+    def _remove_other_users_with_email(self, email: str, user_id: int) -> None:
+        # Runs as a job, so it must stay idempotent. Matches the functional
+        # index on LOWER(email).
+        other_user_ids = list(
+            get_user_model()
+            .objects.alias(email_lower=Lower("email"))
+            .filter(email_lower=normalize_email_address(email))
+            .exclude(id=user_id)
+            .values_list("id", flat=True)
+        )
+
+        if other_user_ids:
+            self.remove_users(other_user_ids)
 
-            email_address_model.user_model = user_model
-            email_address_model.email = email
-            email_address_model.is_verified = is_verified
-            email_address_model.is_primary = is_primary
-            email_address_model.save()
+    def is_username_available(self, safe_username: str) -> bool:
+        """Whether a sign-up with the username would currently succeed.
 
-            # If a user successfully adds a linked email address, delete other users
-            # who have it as an email address
-            get_user_model().objects.filter(email=email).exclude(
-                id=user_model.id
-            ).delete()
+        Most answers come from the in-memory filter of taken usernames without
+        a query; the database is only checked when the username may be taken.
+        """
+
+        user_update_validator.load({"username": safe_username})
+
+        return username_availability_service.is_available(
+            get_user_model().normalize_username(safe_username)
+        )
 
     def create_user(
         self,
@@ -58,6 +262,79 @@ class UserService:
         safe_first_name: str = "",
         safe_last_name: str = "",
     ) -> tuple["User", str]:
+        self._validate_new_user(
+            safe_username,
+            unsafe_password,
+            safe_email,
+            safe_terms_of_service,
+            safe_first_name,
+            safe_last_name,
+        )
+        self._check_username_is_available(safe_username)
+
+        user_model = self._insert_user(
+            safe_username,
+            password_hashing_service.make_password(unsafe_password),
+            safe_email,
+            safe_first_name,
+            safe_last_name,
+        )
+
+        access_token = self.create_access_token(user_model)["access"]
+        return (user_model, access_token)
+
+    async def acreate_user(
+        self,
+        safe_username: str,
+        unsafe_password: str,
+        safe_email: str,
+        safe_terms_of_service: bool,
+        safe_first_name: str = "",
+        safe_last_name: str = "",
+    ) -> tuple["User", str]:
+        self._validate_new_user(
+            safe_username,
+            unsafe_password,
+            safe_email,
+            safe_terms_of_service,
+            safe_first_name,
+            safe_last_name,
+        )
+        await sync_to_async(self._check_username_is_available)(safe_username)
+
+        hashed_password = await password_hashing_service.amake_password(unsafe_password)
+        user_model = await sync_to_async(self._insert_user)(
+            safe_username,
+            hashed_password,
+            safe_email,
+            safe_first_name,
+            safe_last_name,
+        )
+
+        access_token = self.create_access_token(user_model)["access"]
+        return (user_model, access_token)
+
+    def _check_username_is_available(self, safe_username: str) -> None:
+        """Reject taken usernames before paying for the password hash.
+
+        A free username is usually answered by the filter without a query. The
+        unique constraint still decides races with concurrent sign-ups.
+        """
+
+        if not username_availability_service.is_available(
+            get_user_model().normalize_username(safe_username)
+        ):
+            raise domain_errors.UsernameAlreadyExistsError()
+
+    def _validate_new_user(
+        self,
+        safe_username: str,
+        unsafe_password: str,
+        safe_email: str,
+        safe_terms_of_service: bool,
+        safe_first_name: str,
+        safe_last_name: str,
+    ) -> None:
         fields_to_validate_dict = {
             "first_name": safe_first_name,
             "last_name": safe_last_name,
@@ -67,37 +344,225 @@ class UserService:
             "terms_of_service": safe_terms_of_service,
         }
 
-        UserCreationValidator().load(fields_to_validate_dict)
+        user_creation_validator.load(fields_to_validate_dict)
 
         if not safe_terms_of_service:
             raise domain_errors.TermsNotAcceptedError()
 
-        if get_user_model().objects.filter(username=safe_username).exists():
-            raise domain_errors.UsernameAlreadyExistsError()
-
-        if EmailAddress.objects.filter(email=safe_email, is_verified=True).exists():
-            raise domain_errors.EmailAddressAlreadyExistsError()
-
+    @timed("insert_user")
+    def _insert_user(
+        self,
+        safe_username: str,
+        hashed_password: str,
+        safe_email: str,
+        safe_first_name: str,
+        safe_last_name: str,
+    ) -> "User":
+        user_model: "User" = get_user_model()(
+            username=get_user_model().normalize_username(safe_username),
+            email=get_user_model().objects.normalize_email(safe_email),
+            password=hashed_password,
+            first_name=safe_first_name,
+            last_name=safe_last_name,
+        )
+
+        # Uniqueness is enforced by the database constraints instead of checking
+        # beforehand, so a conflicting insert is mapped back to a domain error.
         with transaction.atomic():
-            user_model: "User" = get_user_model().objects.create_user(
-                username=safe_username,
-                email=safe_email,
-                password=unsafe_password,
-                first_name=safe_first_name,
-                last_name=safe_last_name,
+            try:
+                user_model.save(force_insert=True)
+            except IntegrityError as e:
+                raise domain_errors.UsernameAlreadyExistsError() from e
+
+            # An unverified address is claimed by the new user; a verified one
+            # is left untouched and makes the insert below conflict.
+            claimed_count = EmailAddress.objects.filter(
+                normalized_email=normalize_email_address(safe_email),
+                is_verified=False,
+            ).update(user_model=user_model, is_primary=True)
+
+            if claimed_count:
+                # The previous owners may cascade into many rows, so they are
+                # deleted by a background job.
+                job_service.enqueue(
+                    "remove_other_users_with_email",
+                    email=safe_email,
+                    user_id=user_model.id,
+                )
+            else:
+                try:
+                    EmailAddress.objects.create(
+                        user_model=user_model, email=safe_email, is_primary=True
+                    )
+                except IntegrityError as e:
+                    raise domain_errors.EmailAddressAlreadyExistsError() from e
+
+            job_service.enqueue(
+                "send_verification_email", email=safe_email, user_id=user_model.id
             )
-            user_model.full_clean()
-            user_model.save()
 
-            self.update_or_create_email_address(
-                user_model, safe_email, is_primary=True, is_verified=False
-            )
+        username_availability_service.add([user_model.username])
 
-        access_token = self.create_access_token(user_model)["access"]
-        return (user_model, access_token)
+        return user_model
+
+    def bulk_create_users(
+        self,
+        unsafe_records: Iterable[Any],
+        batch_size: int = 1000,
+        result: Optional[BulkCreationResult] = None,
+    ) -> BulkCreationResult:
+        """Create users from a stream of records, one transaction per batch.
+
+        Records are sanitized and validated like sign-ups, but an email address
+        that is already taken is reported as a conflict even when unverified;
+        bulk provisioning never deletes existing users. Errors are returned per
+        record index instead of being raised.
+
+        Batches are committed as they are read, so if reading the stream fails
+        the batches before it are kept; pass `result` to know how far it got.
+        """
+
+        if result is None:
+            result = {"created_count": 0, "errors": []}
+        indexed_records = enumerate(unsafe_records)
+
+        while batch := list(itertools.islice(indexed_records, batch_size)):
+            self._bulk_create_user_batch(batch, result)
+
+        result["errors"].sort(key=lambda error: error[0])
+        return result
+
+    def _bulk_create_user_batch(
+        self, batch: list[tuple[int, Any]], result: BulkCreationResult
+    ) -> None:
+        unsafe_records = [
+            {
+                key: strip_xss(value)
+                if isinstance(value, str) and key != "password"
+                else value
+                for key, value in unsafe_record.items()
+            }
+            if isinstance(unsafe_record, dict)
+            else unsafe_record
+            for _, unsafe_record in batch
+        ]
+
+        loaded_records, validation_errors = user_creation_validator.load_many(
+            unsafe_records
+        )
+        records: dict[int, dict[str, Any]] = {
+            batch[position][0]: record for position, record in loaded_records.items()
+        }
+        result["errors"].extend(
+            (batch[position][0], error) for position, error in validation_errors.items()
+        )
+
+        if not records:
+            return
+
+        usernames = [record["username"] for record in records.values()]
+        emails = [
+            normalize_email_address(record["email"]) for record in records.values()
+        ]
+        # Deleted users keep their usernames until they are purged.
+        taken_usernames = set(
+            get_user_model()
+            .all_objects.filter(username__in=usernames)
+            .values_list("username", flat=True)
+        )
+        taken_emails = set(
+            EmailAddress.objects.filter(normalized_email__in=emails).values_list(
+                "normalized_email", flat=True
+            )
+        )
+
+        rows: list[tuple[int, "User", EmailAddress]] = []
+
+        for index, record in records.items():
+            if not record["terms_of_service"]:
+                result["errors"].append((index, domain_errors.TermsNotAcceptedError()))
+                continue
+
+            if record["username"] in taken_usernames:
+                result["errors"].append(
+                    (index, domain_errors.UsernameAlreadyExistsError())
+                )
+                continue
+
+            normalized_email = normalize_email_address(record["email"])
+            if normalized_email in taken_emails:
+                result["errors"].append(
+                    (index, domain_errors.EmailAddressAlreadyExistsError())
+                )
+                continue
+
+            taken_usernames.add(record["username"])
+            taken_emails.add(normalized_email)
+
+            user_model: "User" = get_user_model()(
+                username=get_user_model().normalize_username(record["username"]),
+                email=get_user_model().objects.normalize_email(record["email"]),
+                first_name=record.get("first_name", ""),
+                last_name=record.get("last_name", ""),
+            )
+            email_address_model = EmailAddress(
+                user_model=user_model, email=record["email"], is_primary=True
+            )
+            rows.append((index, user_model, email_address_model))
+
+        if not rows:
+            return
+
+        # Hashing dominates the cost of a batch, so spread it over the pool.
+        hashed_passwords = password_hashing_service.make_passwords(
+            records[index]["password"] for index, _, _ in rows
+        )
+        for (_, user_model, _), hashed_password in zip(rows, hashed_passwords):
+            user_model.password = hashed_password
+
+        try:
+            with transaction.atomic():
+                get_user_model().objects.bulk_create([row[1] for row in rows])
+                EmailAddress.objects.bulk_create([row[2] for row in rows])
+        except IntegrityError:
+            # Another writer took a username or an address after the checks
+            # above, so fall back to inserting the batch one user at a time.
+            self._create_users_one_by_one(rows, result)
+        else:
+            result["created_count"] += len(rows)
+            username_availability_service.add(
+                user_model.username for _, user_model, _ in rows
+            )
 
+    def _create_users_one_by_one(
+        self,
+        rows: list[tuple[int, "User", EmailAddress]],
+        result: BulkCreationResult,
+    ) -> None:
+        for index, user_model, email_address_model in rows:
+            user_model.pk = None
+
+            try:
+                with transaction.atomic():
+                    try:
+                        user_model.save(force_insert=True)
+                    except IntegrityError as e:
+                        raise domain_errors.UsernameAlreadyExistsError() from e
+
+                    email_address_model.user_model = user_model
+                    try:
+                        email_address_model.save(force_insert=True)
+                    except IntegrityError as e:
+                        raise domain_errors.EmailAddressAlreadyExistsError() from e
+            except domain_errors.Error as e:
+                result["errors"].append((index, e))
+            else:
+                result["created_count"] += 1
+                username_availability_service.add([user_model.username])
+
+    @timed("token")
     def create_access_token(self, user_model: "User") -> TokenResponse:
-        refresh = RefreshToken.for_user(user_model)
+        refresh = TokenSerializer.get_token(user_model)
 
         return {
             "refresh": str(refresh),
@@ -105,14 +570,137 @@ class UserService:
         }
 
     def remove_user(self, user_id: int) -> None:
-        if not self.does_user_exists(user_id):
+        if not self.remove_users([user_id]):
             raise domain_errors.UserDoesNotExistsError()
 
-        with transaction.atomic():
-            user_model: "User" = (
-                get_user_model().objects.select_for_update().get(pk=user_id)
+    def remove_users(self, user_ids: list[int]) -> list[int]:
+        """Mark the users as deleted, returning the ids that existed.
+
+        This only updates the users' rows, however many rows depend on them;
+        a job purges the users and their dependents later.
+        """
+
+        qn = connection.ops.quote_name
+        # Ids from URLs arrive as strings, which PostgreSQL will not compare
+        # with the bigint ids in the array.
+        user_ids = [int(user_id) for user_id in user_ids]
+
+        # Users are never left marked as deleted without a purge to come.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {qn(get_user_model()._meta.db_table)} SET deleted_at = %s "
+                f"WHERE id = ANY(%s) AND deleted_at IS NULL RETURNING id",
+                [timezone.now(), user_ids],
+            )
+            removed_user_ids = [row[0] for row in cursor.fetchall()]
+
+            if removed_user_ids:
+                # A waiting purge will pick these users up too.
+                job_service.enqueue("purge_deleted_users", deduplicate=True)
+
+        if removed_user_ids:
+            self.profile_cache.delete(*removed_user_ids)
+
+        return removed_user_ids
+
+    def purge_deleted_users(self) -> int:
+        """Delete up to `USER_PURGE_BATCH_SIZE` of the users marked as deleted,
+        and every row that depends on them, returning how many were purged.
+
+        A full batch enqueues the next one `USER_PURGE_PAUSE_SECONDS` later,
+        so that a large purge commits as it goes and leaves room to other
+        writers. Purges running at once skip each other's users.
+        """
+
+        user_ids = list(
+            get_user_model()
+            .all_objects.filter(deleted_at__isnull=False)
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[: settings.USER_PURGE_BATCH_SIZE]
+        )
+        if not user_ids:
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(get_cascade_delete_sql(get_user_model()), [user_ids])
+            purged_count = cursor.rowcount
+
+        username_availability_service.discard(purged_count)
+
+        if len(user_ids) == settings.USER_PURGE_BATCH_SIZE:
+            job_service.enqueue(
+                "purge_deleted_users", delay=settings.USER_PURGE_PAUSE_SECONDS
             )
-            user_model.delete()
+
+        return purged_count
+
+    async def aremove_user(self, user_id: int) -> None:
+        await sync_to_async(self.remove_user)(user_id)
+
+    def get_users(self, unsafe_filters: dict[str, Any]) -> QuerySet:
+        """Return the users matching the given filters, ordered for pagination."""
+
+        filters = user_list_filter_validator.load(unsafe_filters)
+
+        user_queryset = (
+            get_user_model()
+            .objects.only(
+                "id", "first_name", "last_name", "username", "email", "date_joined"
+            )
+            .order_by("id")
+        )
+
+        if "is_active" in filters:
+            user_queryset = user_queryset.filter(is_active=filters["is_active"])
+        if "is_staff" in filters:
+            user_queryset = user_queryset.filter(is_staff=filters["is_staff"])
+        if "is_verified" in filters:
+            has_verified_email_address = Exists(
+                EmailAddress.objects.filter(user_model=OuterRef("pk"), is_verified=True)
+            )
+            if filters["is_verified"]:
+                user_queryset = user_queryset.filter(has_verified_email_address)
+            else:
+                user_queryset = user_queryset.filter(~has_verified_email_address)
+
+        return user_queryset
+
+    def search_users(self, unsafe_params: dict[str, Any]) -> QuerySet:
+        """Return the users whose username, first or last name match the query,
+        most similar first.
+
+        In "prefix" mode a field must start with the query, for typeahead; in
+        "fuzzy" mode it must be trigram-similar to it, which tolerates typos.
+        Both are served by the trigram indexes on the lowercased fields.
+        """
+
+        params = user_search_validator.load(unsafe_params)
+        query = params["q"].lower()
+
+        # The aliases repeat the indexed expressions, so that the planner can
+        # combine the three indexes.
+        user_queryset = get_user_model().objects.alias(
+            **{f"{field}_lower": Lower(field) for field in USER_SEARCH_FIELDS}
+        )
+
+        lookup = "startswith" if params["mode"] == "prefix" else "trigram_similar"
+        condition = Q()
+        for field in USER_SEARCH_FIELDS:
+            condition |= Q(**{f"{field}_lower__{lookup}": query})
+
+        return (
+            user_queryset.filter(condition)
+            .annotate(
+                rank=Greatest(
+                    *(
+                        TrigramSimilarity(f"{field}_lower", query)
+                        for field in USER_SEARCH_FIELDS
+                    )
+                )
+            )
+            .only("id", "first_name", "last_name", "username", "email", "date_joined")
+            .order_by("-rank", "id")
+        )
 
     def get_user_profile(self, user_model: "User") -> dict[str, Any]:
         return {
@@ -123,42 +711,198 @@ class UserService:
             "date_joined": user_model.date_joined.isoformat(),
         }
 
+    def get_user_profile_by_id(self, user_id: int) -> dict[str, Any]:
+        return self.get_versioned_user_profile_by_id(user_id)[1]
+
+    def get_versioned_user_profile_by_id(self, user_id: int) -> VersionedProfile:
+        versioned_profile = self.profile_cache.get(user_id)
+        if versioned_profile is not None:
+            return versioned_profile
+
+        user_model = (
+            get_user_model()
+            .objects.only(
+                "first_name", "last_name", "username", "email", "date_joined", "version"
+            )
+            .filter(id=user_id)
+            .first()
+        )
+        if user_model is None:
+            raise domain_errors.UserDoesNotExistsError()
+
+        versioned_profile = (user_model.version, self.get_user_profile(user_model))
+        self.profile_cache.set(user_id, versioned_profile)
+
+        return versioned_profile
+
+    def get_user_profile_version(self, user_id: int) -> int:
+        """Return the version of the profile, which changes whenever the
+        profile does, from the cache or else with an index-only lookup."""
+
+        versioned_profile = self.profile_cache.get(user_id)
+        if versioned_profile is not None:
+            return versioned_profile[0]
+
+        version = (
+            get_user_model()
+            .objects.filter(id=user_id)
+            .values_list("version", flat=True)
+            .first()
+        )
+        if version is None:
+            raise domain_errors.UserDoesNotExistsError()
+
+        return version
+
+    async def aget_user_profile_by_id(self, user_id: int) -> dict[str, Any]:
+        return await sync_to_async(self.get_user_profile_by_id)(user_id)
+
     def update_user_profile_by_id(
         self,
         user_id: int,
-        safe_username: str,
-        safe_first_name: str,
-        safe_last_name: str,
-    ) -> "User":
-
-        fields_to_validate = {
-            "username": safe_username,
-            "first_name": safe_first_name,
-            "last_name": safe_last_name,
+        safe_username: Optional[str] = None,
+        safe_first_name: Optional[str] = None,
+        safe_last_name: Optional[str] = None,
+        expected_versions: Optional[list[int]] = None,
+    ) -> VersionedProfile:
+        """Update the given profile fields and return the updated profile and
+        its version.
+
+        Fields that are `None` or empty are left untouched. The update is a
+        single statement that only writes when a value actually changes and
+        skips usernames taken by another user; a second query is only needed
+        to tell why nothing was written.
+
+        With `expected_versions`, the update is a compare-and-swap: it only
+        applies while the profile is at one of those versions, and raises
+        `ProfileVersionConflictError` otherwise. No row lock is held beyond
+        the statement itself.
+        """
+
+        fields = {
+            field: value
+            for field, value in (
+                ("username", safe_username),
+                ("first_name", safe_first_name),
+                ("last_name", safe_last_name),
+            )
+            if value
         }
 
-        UserUpdateValidator().load(fields_to_validate, partial=("username",))
+        user_update_validator.load(fields)
 
-        if not self.does_user_exists(user_id):
+        if "username" in fields:
+            # As on creation, so that the uniqueness check below compares
+            # normalized usernames.
+            fields["username"] = get_user_model().normalize_username(
+                fields["username"]
+            )
+
+        if not fields:
+            versioned_profile = self.get_versioned_user_profile_by_id(user_id)
+            self._check_version(versioned_profile[0], expected_versions)
+            return versioned_profile
+
+        qn = connection.ops.quote_name
+        table = qn(get_user_model()._meta.db_table)
+        columns = [qn(field) for field in fields]
+        values = list(fields.values())
+
+        sql = (
+            f"UPDATE {table} SET {', '.join(f'{c} = %s' for c in columns)}, "
+            f"version = version + 1 WHERE id = %s AND deleted_at IS NULL AND "
+            f"({', '.join(columns)}) IS "
+            f"DISTINCT FROM ({', '.join(['%s'] * len(columns))}) "
+        )
+        params = [*values, user_id, *values]
+
+        if expected_versions is not None:
+            sql += "AND version = ANY(%s) "
+            params.append(expected_versions)
+
+        if "username" in fields:
+            sql += (
+                f"AND NOT EXISTS (SELECT 1 FROM {table} WHERE username = %s "
+                f"AND id <> %s) "
+            )
+            params += [fields["username"], user_id]
+
+        sql += "RETURNING first_name, last_name, username, email, date_joined, version"
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+        except IntegrityError as e:
+            # A concurrent update took the username after the NOT EXISTS check.
+            raise domain_errors.UsernameAlreadyExistsError() from e
+
+        if row is None:
+            return self._get_unchanged_user_profile(user_id, fields, expected_versions)
+
+        self.profile_cache.delete(user_id)
+
+        if "username" in fields:
+            username_availability_service.add([fields["username"]])
+            username_availability_service.discard()
+
+        profile = self.get_user_profile(
+            get_user_model()(
+                first_name=row[0],
+                last_name=row[1],
+                username=row[2],
+                email=row[3],
+                date_joined=row[4],
+            )
+        )
+
+        return row[5], profile
+
+    def _get_unchanged_user_profile(
+        self,
+        user_id: int,
+        fields: dict[str, str],
+        expected_versions: Optional[list[int]],
+    ) -> VersionedProfile:
+        """Explain an update that wrote nothing: the user is missing, the
+        profile changed since the expected version, the username is taken, or
+        the values were already up to date."""
+
+        user_model = (
+            get_user_model()
+            .objects.only(
+                "first_name", "last_name", "username", "email", "date_joined", "version"
+            )
+            .filter(id=user_id)
+            .first()
+        )
+        if user_model is None:
             raise domain_errors.UserDoesNotExistsError()
 
-        if get_user_model().objects.filter(username=safe_username).exclude(id=user_id):
+        self._check_version(user_model.version, expected_versions)
+
+        if any(getattr(user_model, field) != value for field, value in fields.items()):
             raise domain_errors.UsernameAlreadyExistsError()
 
-        with transaction.atomic():
-            db_user_model: "User" = (
-                get_user_model().objects.select_for_update().get(pk=user_id)
-            )
-            if len(safe_username) > 0:
-                db_user_model.username = safe_username
-            if len(safe_first_name) > 0:
-                db_user_model.first_name = safe_first_name
-            if len(safe_last_name) > 0:
-                db_user_model.last_name = safe_last_name
-            db_user_model.full_clean(exclude=["username"])
-            db_user_model.save(update_fields=["username", "first_name", "last_name"])
-
-        return db_user_model
+        return user_model.version, self.get_user_profile(user_model)
+
+    def _check_version(
+        self, version: int, expected_versions: Optional[list[int]]
+    ) -> None:
+        if expected_versions is not None and version not in expected_versions:
+            raise domain_errors.ProfileVersionConflictError()
+
+    async def aupdate_user_profile_by_id(
+        self,
+        user_id: int,
+        safe_username: Optional[str] = None,
+        safe_first_name: Optional[str] = None,
+        safe_last_name: Optional[str] = None,
+        expected_versions: Optional[list[int]] = None,
+    ) -> VersionedProfile:
+        return await sync_to_async(self.update_user_profile_by_id)(
+            user_id, safe_username, safe_first_name, safe_last_name, expected_versions
+        )
 
     def does_user_exists(self, user_id: int) -> bool:
         return get_user_model().objects.filter(id=user_id).exists()
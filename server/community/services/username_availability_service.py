@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+from utils.bloom_utils import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+class UsernameAvailabilityService:
+    """Answers "is this username taken?" mostly without querying the database.
+
+    Taken usernames are kept in a Bloom filter, built from a streaming scan of
+    the users table and updated by `UserService` as users are created, renamed
+    and purged. A miss means the username is free; only a possible hit is
+    confirmed with a query. Until the filter is built every check queries.
+
+    The filter is maintained by a background thread, started with the server
+    by `start`, so that no request waits for a scan. Users created by other
+    processes are picked up every `USERNAME_FILTER_REFRESH_SECONDS` by
+    scanning the ids above the last one seen. The filter can not forget a
+    username, so renames and purges leave false positives that only cost a
+    query; past `USERNAME_FILTER_MAX_STALE_RATIO` of the filter, and every
+    `USERNAME_FILTER_REBUILD_SECONDS` to catch renames made elsewhere, a new
+    filter is built and swapped in. Answers are therefore advisory: sign-up
+    still relies on the unique constraint.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the filter, so that checks query until it is built again."""
+
+        with self._lock:
+            self._filter: Optional[BloomFilter] = None
+            # Usernames taken while a new filter is being built.
+            self._pending: Optional[list[str]] = None
+            self._last_user_id = 0
+            self._stale_count = 0
+            self._built_at = 0.0
+
+    def start(self) -> None:
+        """Build the filter and keep it up to date in a background thread.
+
+        Called once per server process, from `sports.wsgi` and `sports.asgi`.
+        """
+
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, name="username-filter", daemon=True
+        )
+        self._thread.start()
+
+    def is_available(self, safe_username: str) -> bool:
+        bloom_filter = self._filter
+
+        if bloom_filter is not None and safe_username not in bloom_filter:
+            return True
+
+        # Deleted users keep their usernames until they are purged.
+        return not get_user_model().all_objects.filter(username=safe_username).exists()
+
+    def add(self, usernames: Iterable[str]) -> None:
+        """Record usernames that were just taken."""
+
+        usernames = list(usernames)
+
+        with self._lock:
+            if self._pending is not None:
+                self._pending.extend(usernames)
+
+            if self._filter is not None:
+                for username in usernames:
+                    self._filter.add(username)
+
+    def discard(self, count: int = 1) -> None:
+        """Record that `count` usernames were freed, by renames or purges."""
+
+        self._stale_count += count
+
+    def update(self) -> None:
+        """Build a new filter when one is due, else add the users created
+        since the last update."""
+
+        if self._must_rebuild(time.monotonic()):
+            self.rebuild()
+        else:
+            self._add_new_users()
+
+    def rebuild(self) -> None:
+        """Build a new filter from the users table and swap it in.
+
+        Checks keep using the current filter, and `add` keeps updating it,
+        during the scan.
+        """
+
+        built_at = time.monotonic()
+        with self._lock:
+            self._pending = []
+            stale_count = self._stale_count
+
+        try:
+            user_count = get_user_model().all_objects.count()
+            bloom_filter = BloomFilter(
+                # Headroom for sign-ups until the next rebuild.
+                max(settings.USERNAME_FILTER_MIN_CAPACITY, user_count * 2),
+                settings.USERNAME_FILTER_ERROR_RATE,
+            )
+            last_user_id = 0
+            for user_id, username in self._get_users_after(0):
+                bloom_filter.add(username)
+                last_user_id = user_id
+        except BaseException:
+            with self._lock:
+                self._pending = None
+            raise
+
+        with self._lock:
+            for username in self._pending:
+                bloom_filter.add(username)
+
+            self._pending = None
+            self._filter = bloom_filter
+            self._last_user_id = last_user_id
+            self._stale_count -= stale_count
+            self._built_at = built_at
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.update()
+            except Exception:
+                # Most likely a lost connection, which the next query reopens.
+                logger.exception("Could not update the username filter.")
+                connections.close_all()
+
+            time.sleep(settings.USERNAME_FILTER_REFRESH_SECONDS)
+
+    def _must_rebuild(self, now: float) -> bool:
+        if self._filter is None:
+            return True
+
+        return (
+            now - self._built_at > settings.USERNAME_FILTER_REBUILD_SECONDS
+            or self._stale_count
+            > self._filter.capacity * settings.USERNAME_FILTER_MAX_STALE_RATIO
+            or self._filter.count > self._filter.capacity
+        )
+
+    def _add_new_users(self) -> None:
+        rows = list(self._get_users_after(self._last_user_id))
+
+        with self._lock:
+            if self._filter is None:
+                return
+
+            for user_id, username in rows:
+                self._filter.add(username)
+                self._last_user_id = max(self._last_user_id, user_id)
+
+    def _get_users_after(self, user_id: int) -> Iterator[tuple[int, str]]:
+        return (
+            get_user_model()
+            .all_objects.filter(id__gt=user_id)
+            .order_by("id")
+            .values_list("id", "username")
+            .iterator(chunk_size=10_000)
+        )
+
+
+username_availability_service = UsernameAvailabilityService()
@@ -0,0 +1,97 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, TestCase
+
+import community.views.async_views
+from community.services import user_service
+from utils.test_utils import *
+from utils.throttling_utils import reset_throttles
+from community.models import User
+
+
+class UserTestCase(TestCase):
+    def setUp(self) -> None:
+        self.factory = AsyncRequestFactory()
+        user_service.profile_cache.clear()
+        reset_throttles()
+
+        self.maxDiff = None
+
+    async def test_valid_sign_up(self):
+        post_request_data = {
+            "username": "user",
+            "email": "example@example.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+            "first_name": "<b>Josh</b>",
+        }
+
+        request = self.factory.post(
+            "/api/async/sign-up/",
+            data=post_request_data,
+            content_type="application/json",
+        )
+
+        response = await community.views.async_views.sign_up(request)
+
+        self.assertEqual(response.status_code, 201)
+
+        user_model = await sync_to_async(User.objects.get)(username="user")
+        self.assertEqual(json.loads(response.content)["data"]["user_id"], user_model.id)
+        self.assertEqual(user_model.first_name, "Josh")
+        self.assertTrue(await sync_to_async(user_model.check_password)("pAssw0rd!"))
+
+    async def test_username_conflicts_are_reported(self):
+        await sync_to_async(UserFactory)(username="user", email="user@example.com")
+
+        post_request_data = {
+            "username": "user",
+            "email": "example@example.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+        }
+
+        request = self.factory.post(
+            "/api/async/sign-up/",
+            data=post_request_data,
+            content_type="application/json",
+        )
+
+        response = await community.views.async_views.sign_up(request)
+
+        expected_response = {
+            "errors": {
+                "display_error": "An account with this username already exists.",
+                "internal_error_code": 40901,
+            }
+        }
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(json.loads(response.content), expected_response)
+
+    async def test_can_retrieve_user_profile_with_an_access_token(self):
+        user_model = await sync_to_async(UserFactory)(
+            username="josh", email="josh@example.com", first_name="Josh"
+        )
+        access_token = user_service.create_access_token(user_model)["access"]
+
+        request = self.factory.get(
+            f"/api/async/users/{user_model.id}/",
+            authorization=f"Bearer {access_token}",
+        )
+
+        response = await community.views.async_views.user_detail(request, user_model.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["data"]["first_name"], "Josh")
+
+    async def test_user_must_be_authenticated_to_view_their_profile(self):
+        request = self.factory.get("/api/async/users/me/")
+
+        response = await community.views.async_views.get_me(request)
+
+        expected_response = {"detail": "Authentication credentials were not provided."}
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content), expected_response)
@@ -0,0 +1,62 @@
+from django.test import SimpleTestCase
+
+from utils.benchmark_utils import compare_results, get_percentiles
+
+
+class BenchmarkUtilsTestCase(SimpleTestCase):
+    def get_result(self, p95_ms, queries_per_request, scenario="sign_up"):
+        return {
+            "scenario": scenario,
+            "dataset_size": 1000,
+            "requests": 100,
+            "p50_ms": 1.0,
+            "p95_ms": p95_ms,
+            "p99_ms": p95_ms,
+            "requests_per_second": 100.0,
+            "queries_per_request": queries_per_request,
+            "peak_memory_kib": 10.0,
+        }
+
+    def test_percentiles_interpolate_between_samples(self):
+        percentiles = get_percentiles([float(i) for i in range(101)])
+
+        self.assertEqual(sorted(percentiles), list(range(1, 100)))
+        self.assertAlmostEqual(percentiles[1], 1.0)
+        self.assertAlmostEqual(percentiles[50], 50.0)
+        self.assertAlmostEqual(percentiles[99], 99.0)
+
+        percentiles = get_percentiles([4.0, 1.0, 3.0, 2.0])
+
+        self.assertAlmostEqual(percentiles[50], 2.5)
+        self.assertAlmostEqual(percentiles[95], 3.85)
+
+    def test_a_single_sample_is_every_percentile(self):
+        percentiles = get_percentiles([7.0])
+
+        self.assertEqual(set(percentiles.values()), {7.0})
+
+    def test_slower_results_and_extra_queries_are_regressions(self):
+        baseline = [
+            self.get_result(10.0, 2.0),
+            self.get_result(10.0, 2.0, scenario="log_in"),
+        ]
+        results = [
+            self.get_result(12.5, 3.0),
+            self.get_result(11.9, 2.0, scenario="log_in"),
+            self.get_result(100.0, 9.0, scenario="user_detail"),
+        ]
+
+        self.assertEqual(
+            compare_results(results, baseline, max_regression=0.2),
+            [
+                "sign_up (1000 users): p95 went from 10.0ms to 12.5ms.",
+                "sign_up (1000 users): queries per request went from 2.0 to 3.0.",
+            ],
+        )
+
+    def test_faster_results_are_not_regressions(self):
+        baseline = [self.get_result(10.0, 2.0)]
+
+        self.assertEqual(
+            compare_results([self.get_result(5.0, 1.0)], baseline, 0.2), []
+        )
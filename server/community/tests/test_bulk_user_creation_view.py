@@ -0,0 +1,279 @@
+import io
+import json
+import tempfile
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+import community.views.user_views
+from utils.test_utils import *
+from community.models import User
+from community.services import user_service
+
+
+class UserTestCase(TestCase):
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+        self.view = community.views.user_views.BulkUserCreationView.as_view()
+        self.admin = UserFactory(
+            username="admin", email="admin@example.com", is_staff=True
+        )
+
+        self.maxDiff = None
+
+    def test_admin_can_create_users_in_bulk(self):
+        post_request_data = [
+            {
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password": "pAssw0rd!",
+                "terms_of_service": True,
+                "first_name": "<b>Josh</b>",
+            }
+            for i in range(20)
+        ]
+
+        request = self.factory.post(
+            "/api/users/bulk/", data=post_request_data, format="json"
+        )
+        force_authenticate(request, self.admin)
+
+        with self.assertNumQueries(6):
+            response = self.view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"data": {"created_count": 20, "errors": []}})
+
+        self.assertEqual(21, User.objects.count())
+        self.assertEqual(21, EmailAddress.objects.count())
+        self.assertEqual(
+            20, EmailAddress.objects.filter(user_model__first_name="Josh").count()
+        )
+
+    def test_errors_are_reported_per_record(self):
+        post_request_data = [
+            {
+                "username": "admin",
+                "email": "other@example.com",
+                "password": "pAssw0rd!",
+                "terms_of_service": True,
+            },
+            {
+                "username": "josh",
+                "email": "admin@example.com",
+                "password": "pAssw0rd!",
+                "terms_of_service": True,
+            },
+            {
+                "username": "23josh",
+                "email": "josh@example.com",
+                "password": "pAssw0rd!",
+                "terms_of_service": True,
+            },
+            {
+                "username": "jeff",
+                "email": "jeff@example.com",
+                "password": "pAssw0rd!",
+                "terms_of_service": False,
+            },
+            {
+                "username": "john",
+                "email": "john@example.com",
+                "password": "pAssw0rd!",
+                "terms_of_service": True,
+            },
+            {
+                "username": "john",
+                "email": "john2@example.com",
+                "password": "pAssw0rd!",
+                "terms_of_service": True,
+            },
+        ]
+
+        request = self.factory.post(
+            "/api/users/bulk/", data=post_request_data, format="json"
+        )
+        force_authenticate(request, self.admin)
+
+        response = self.view(request)
+
+        expected_response = {
+            "data": {
+                "created_count": 1,
+                "errors": [
+                    {
+                        "index": 0,
+                        "errors": {
+                            "display_error": (
+                                "An account with this username already exists."
+                            ),
+                            "internal_error_code": 40901,
+                        },
+                    },
+                    {
+                        "index": 1,
+                        "errors": {
+                            "display_error": (
+                                "An account with this email address already exists."
+                            ),
+                            "internal_error_code": 40902,
+                        },
+                    },
+                    {
+                        "index": 2,
+                        "errors": {
+                            "display_error": "",
+                            "field_errors": {
+                                "username": [
+                                    "Username must start with a letter, and contain"
+                                    " only letters, numbers, and underscores."
+                                ]
+                            },
+                        },
+                    },
+                    {
+                        "index": 3,
+                        "errors": {
+                            "display_error": "You must accept the terms of service.",
+                            "internal_error_code": 42901,
+                        },
+                    },
+                    {
+                        "index": 5,
+                        "errors": {
+                            "display_error": (
+                                "An account with this username already exists."
+                            ),
+                            "internal_error_code": 40901,
+                        },
+                    },
+                ],
+            }
+        }
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, expected_response)
+
+        self.assertEqual(2, User.objects.count())
+        self.assertEqual(2, EmailAddress.objects.count())
+
+    def test_admin_can_create_users_from_csv(self):
+        body = (
+            "username,email,password,terms_of_service\n"
+            "josh,josh@example.com,pAssw0rd!,true\n"
+            "jeff,jeff@example.com,pAssw0rd!,1\n"
+        )
+
+        request = self.factory.post(
+            "/api/users/bulk/", data=body, content_type="text/csv"
+        )
+        force_authenticate(request, self.admin)
+
+        response = self.view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"data": {"created_count": 2, "errors": []}})
+        self.assertEqual(3, User.objects.count())
+
+    def test_only_admins_can_create_users_in_bulk(self):
+        non_admin = UserFactory(username="noadmin", email="noadmin@example.com")
+
+        request = self.factory.post("/api/users/bulk/", data=[], format="json")
+        force_authenticate(request, non_admin)
+
+        with self.assertNumQueries(0):
+            response = self.view(request)
+
+        expected_response = {
+            "detail": "You do not have permission to perform this action."
+        }
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, expected_response)
+
+    def test_import_users_command_reads_ndjson(self):
+        records = [
+            {
+                "username": "josh",
+                "email": "josh@example.com",
+                "password": "pAssw0rd!",
+                "terms_of_service": True,
+            },
+            {
+                "username": "josh",
+                "email": "josh2@example.com",
+                "password": "pAssw0rd!",
+                "terms_of_service": True,
+            },
+        ]
+
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as f:
+            f.write("\n".join(json.dumps(record) for record in records))
+            f.flush()
+
+            stdout = io.StringIO()
+            call_command("import_users", f.name, stdout=stdout, stderr=io.StringIO())
+
+        errors = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        self.assertEqual(2, User.objects.count())
+        self.assertEqual(1, len(errors))
+        self.assertEqual(1, errors[0]["index"])
+        self.assertEqual(40901, errors[0]["errors"]["internal_error_code"])
+
+    def test_import_users_command_keeps_the_batches_before_a_parse_error(self):
+        lines = [
+            json.dumps(
+                {
+                    "username": f"user{i}",
+                    "email": f"user{i}@example.com",
+                    "password": "pAssw0rd!",
+                    "terms_of_service": i != 1,
+                }
+            )
+            for i in range(3)
+        ]
+        lines.append("{not json")
+
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as f:
+            f.write("\n".join(lines))
+            f.flush()
+
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+            with self.assertRaisesMessage(
+                CommandError, "The 1 users created before the error were kept."
+            ):
+                call_command(
+                    "import_users", f.name, batch_size=2, stdout=stdout, stderr=stderr
+                )
+
+        errors = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        # Only the first batch was committed; the second one never completed.
+        self.assertTrue(User.objects.filter(username="user0").exists())
+        self.assertFalse(User.objects.filter(username="user2").exists())
+        self.assertEqual([1], [error["index"] for error in errors])
+        self.assertIn("Created 1 users, 1 records failed.", stderr.getvalue())
+
+    def test_import_users_command_only_reports_parse_errors_as_such(self):
+        record = {
+            "username": "josh",
+            "email": "josh@example.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+        }
+
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as f:
+            f.write(json.dumps(record))
+            f.flush()
+
+            with mock.patch.object(
+                user_service, "_bulk_create_user_batch", side_effect=ValueError("Bug")
+            ), self.assertRaisesMessage(ValueError, "Bug"):
+                call_command(
+                    "import_users", f.name, stdout=io.StringIO(), stderr=io.StringIO()
+                )
@@ -0,0 +1,76 @@
+import marshmallow
+from django.test import SimpleTestCase
+from marshmallow import EXCLUDE
+
+from community.schemas.compiled_validators import CompiledValidator
+from community.schemas.user_validators import (
+    UserCreationValidator,
+    UserUpdateValidator,
+    user_creation_validator,
+)
+
+
+class CompiledValidatorTestCase(SimpleTestCase):
+    def get_record(self, **fields):
+        return {
+            "username": "josh",
+            "password": "pAssw0rd!",
+            "email": "josh@example.com",
+            "terms_of_service": True,
+            **fields,
+        }
+
+    def test_errors_are_reported_per_record(self):
+        records = [
+            self.get_record(),
+            self.get_record(username="1josh", email="not an email"),
+            self.get_record(first_name="Josh"),
+            {"username": "mary"},
+        ]
+
+        valid_records, errors = user_creation_validator.load_many(records)
+
+        self.assertEqual(sorted(valid_records), [0, 2])
+        self.assertEqual(valid_records[2]["first_name"], "Josh")
+        self.assertEqual(sorted(errors), [1, 3])
+        self.assertEqual(sorted(errors[1].normalized_messages()), ["email", "username"])
+        self.assertEqual(errors[1].data, records[1])
+        self.assertEqual(
+            sorted(errors[3].normalized_messages()),
+            ["email", "password", "terms_of_service"],
+        )
+
+    def test_errors_have_the_shape_of_a_single_load(self):
+        record = self.get_record(email="not an email")
+
+        _, errors = user_creation_validator.load_many([self.get_record(), record])
+
+        with self.assertRaises(marshmallow.ValidationError) as context:
+            user_creation_validator.load(record)
+
+        self.assertEqual(
+            errors[1].normalized_messages(), context.exception.normalized_messages()
+        )
+
+    def test_partial_is_honoured(self):
+        validator = CompiledValidator(UserUpdateValidator, partial=True)
+
+        valid_records, errors = validator.load_many(
+            [{"first_name": "Josh"}, {"username": "1josh"}]
+        )
+
+        self.assertEqual(valid_records, {0: {"first_name": "Josh"}})
+        self.assertEqual(list(errors[1].normalized_messages()), ["username"])
+
+    def test_unknown_is_honoured(self):
+        records = [self.get_record(nickname="jo")]
+
+        _, errors = user_creation_validator.load_many(records)
+
+        self.assertEqual(list(errors[0].normalized_messages()), ["nickname"])
+
+        validator = CompiledValidator(UserCreationValidator, unknown=EXCLUDE)
+        valid_records, errors = validator.load_many(records)
+
+        self.assertEqual(errors, {})
+        self.assertNotIn("nickname", valid_records[0])
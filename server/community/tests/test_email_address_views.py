@@ -0,0 +1,209 @@
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from community.models import EmailAddress, User
+from community.services import user_service
+from community.views.email_address_views import EmailAddressViewSet
+from utils.test_utils import *
+
+
+class EmailAddressTestCase(TestCase):
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+        self.list_view = EmailAddressViewSet.as_view({"get": "list", "post": "create"})
+        self.detail_view = EmailAddressViewSet.as_view({"delete": "destroy"})
+        self.verify_view = EmailAddressViewSet.as_view({"post": "verify"})
+        self.promote_view = EmailAddressViewSet.as_view({"post": "promote"})
+
+        self.user_model = UserFactory(username="josh", email="josh@example.com")
+        self.admin = UserFactory(
+            username="admin", email="admin@example.com", is_staff=True
+        )
+
+        self.maxDiff = None
+
+    def add_email_address(self, email, is_verified=False):
+        return EmailAddress.objects.create(
+            user_model=self.user_model, email=email, is_verified=is_verified
+        )
+
+    def test_user_can_list_their_email_addresses(self):
+        secondary = self.add_email_address("josh@work.com")
+        primary = EmailAddress.objects.get(email="josh@example.com")
+
+        request = self.factory.get(f"/api/users/{self.user_model.id}/emails/")
+        force_authenticate(request, self.user_model)
+
+        with self.assertNumQueries(1):
+            response = self.list_view(request, user_pk=self.user_model.id)
+
+        expected_response = {
+            "data": [
+                {
+                    "id": primary.id,
+                    "email": "josh@example.com",
+                    "is_verified": False,
+                    "is_primary": True,
+                },
+                {
+                    "id": secondary.id,
+                    "email": "josh@work.com",
+                    "is_verified": False,
+                    "is_primary": False,
+                },
+            ]
+        }
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, expected_response)
+
+    def test_users_without_addresses_have_an_empty_list(self):
+        # As created by createsuperuser, without going through the service.
+        superuser = User.objects.create_superuser(
+            "root", "root@example.com", "pAssw0rd!"
+        )
+
+        request = self.factory.get(f"/api/users/{superuser.id}/emails/")
+        force_authenticate(request, superuser)
+
+        with self.assertNumQueries(2):
+            response = self.list_view(request, user_pk=superuser.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"data": []})
+
+        request = self.factory.get("/api/users/10000/emails/")
+        force_authenticate(request, superuser)
+        response = self.list_view(request, user_pk=10000)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_user_can_add_email_addresses(self):
+        for email in ("josh@work.com", "josh@home.com"):
+            request = self.factory.post(
+                f"/api/users/{self.user_model.id}/emails/", data={"email": email}
+            )
+            force_authenticate(request, self.user_model)
+
+            response = self.list_view(request, user_pk=self.user_model.id)
+
+            self.assertEqual(response.status_code, 201)
+            self.assertFalse(response.data["data"]["is_primary"])
+            self.assertFalse(response.data["data"]["is_verified"])
+
+        self.assertEqual(3, self.user_model.emailaddress_set.count())
+
+    def test_user_cant_add_an_email_address_that_is_taken(self):
+        request = self.factory.post(
+            f"/api/users/{self.user_model.id}/emails/",
+            data={"email": "ADMIN@example.com"},
+        )
+        force_authenticate(request, self.user_model)
+
+        response = self.list_view(request, user_pk=self.user_model.id)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["errors"]["internal_error_code"], 40902)
+
+    def test_user_cant_manage_the_email_addresses_of_others(self):
+        request = self.factory.get(f"/api/users/{self.admin.id}/emails/")
+        force_authenticate(request, self.user_model)
+
+        with self.assertNumQueries(0):
+            response = self.list_view(request, user_pk=self.admin.id)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_verified_email_address_can_become_primary(self):
+        email_address_model = self.add_email_address("josh@work.com")
+
+        request = self.factory.post(
+            f"/api/users/{self.user_model.id}/emails/{email_address_model.id}/verify/"
+        )
+        force_authenticate(request, self.admin)
+
+        response = self.verify_view(
+            request, user_pk=self.user_model.id, pk=email_address_model.id
+        )
+
+        self.assertEqual(response.status_code, 204)
+
+        request = self.factory.post(
+            f"/api/users/{self.user_model.id}/emails/{email_address_model.id}/primary/"
+        )
+        force_authenticate(request, self.user_model)
+
+        with self.assertNumQueries(6):
+            response = self.promote_view(
+                request, user_pk=self.user_model.id, pk=email_address_model.id
+            )
+
+        self.assertEqual(response.status_code, 204)
+
+        self.user_model.refresh_from_db()
+        self.assertEqual(self.user_model.email, "josh@work.com")
+        self.assertEqual(
+            ["josh@work.com"],
+            list(
+                EmailAddress.objects.filter(
+                    user_model=self.user_model, is_primary=True
+                ).values_list("email", flat=True)
+            ),
+        )
+
+    def test_unverified_email_address_cant_become_primary(self):
+        email_address_model = self.add_email_address("josh@work.com")
+
+        request = self.factory.post(
+            f"/api/users/{self.user_model.id}/emails/{email_address_model.id}/primary/"
+        )
+        force_authenticate(request, self.user_model)
+
+        response = self.promote_view(
+            request, user_pk=self.user_model.id, pk=email_address_model.id
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"]["internal_error_code"], 40003)
+
+    def test_user_can_remove_secondary_email_addresses_only(self):
+        secondary = self.add_email_address("josh@work.com")
+        primary = EmailAddress.objects.get(email="josh@example.com")
+
+        request = self.factory.delete(
+            f"/api/users/{self.user_model.id}/emails/{secondary.id}/"
+        )
+        force_authenticate(request, self.user_model)
+
+        with self.assertNumQueries(1):
+            response = self.detail_view(
+                request, user_pk=self.user_model.id, pk=secondary.id
+            )
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(EmailAddress.objects.filter(id=secondary.id).exists())
+
+        request = self.factory.delete(
+            f"/api/users/{self.user_model.id}/emails/{primary.id}/"
+        )
+        force_authenticate(request, self.user_model)
+
+        response = self.detail_view(request, user_pk=self.user_model.id, pk=primary.id)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"]["internal_error_code"], 40002)
+
+    def test_primary_email_addresses_are_fetched_in_one_query(self):
+        for i in range(5):
+            UserFactory(username=f"user{i}", email=f"user{i}@example.com")
+        self.add_email_address("josh@work.com")
+
+        user_ids = list(User.objects.values_list("id", flat=True))
+
+        with self.assertNumQueries(1):
+            primary_email_addresses = user_service.get_primary_email_addresses(user_ids)
+
+        self.assertEqual(len(primary_email_addresses), 7)
+        self.assertEqual(
+            primary_email_addresses[self.user_model.id], "josh@example.com"
+        )
@@ -0,0 +1,125 @@
+import time
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from community.models import EmailAddress
+from community.services import (
+    email_verification_service,
+    job_service,
+    user_service,
+)
+from community.views.email_address_views import EmailVerificationView
+from utils.test_utils import *
+
+
+@override_settings(
+    EMAIL_VERIFICATION_URL="https://example.com/verify?token={token}",
+    EMAIL_VERIFICATION_MAX_AGE_SECONDS=3600,
+)
+class EmailVerificationTestCase(TestCase):
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+        self.view = EmailVerificationView.as_view()
+
+        self.user_model = UserFactory(username="josh", email="josh@example.com")
+
+        self.maxDiff = None
+
+    def get_sent_token(self, message):
+        url = next(line for line in message.body.split() if line.startswith("https"))
+        return parse_qs(urlparse(url).query)["token"][0]
+
+    def verify(self, token):
+        request = self.factory.post(
+            "/api/emails/verify/", data={"token": token}, format="json"
+        )
+        return self.view(request)
+
+    def test_sign_up_sends_a_token_that_verifies_the_address(self):
+        job_service.run_pending()
+
+        self.assertEqual(1, len(mail.outbox))
+        self.assertEqual(["josh@example.com"], mail.outbox[0].to)
+
+        with self.assertNumQueries(1):
+            response = self.verify(self.get_sent_token(mail.outbox[0]))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertTrue(
+            EmailAddress.objects.get(user_model=self.user_model).is_verified
+        )
+
+        # Tokens can be used again until they expire.
+        response = self.verify(self.get_sent_token(mail.outbox[0]))
+        self.assertEqual(response.status_code, 204)
+
+    def test_added_addresses_are_sent_a_token(self):
+        job_service.run_pending()
+        user_service.add_email_address(self.user_model.id, "josh@work.com")
+        job_service.run_pending()
+
+        self.assertEqual(["josh@work.com"], mail.outbox[-1].to)
+
+    def test_tampered_tokens_are_rejected(self):
+        email_address_model = EmailAddress.objects.get(user_model=self.user_model)
+        token = email_verification_service.make_token(email_address_model)
+
+        with self.assertNumQueries(0):
+            response = self.verify(token[:-1] + ("A" if token[-1] != "A" else "B"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"]["internal_error_code"], 40004)
+        self.assertFalse(
+            EmailAddress.objects.get(id=email_address_model.id).is_verified
+        )
+
+    def test_expired_tokens_are_rejected(self):
+        email_address_model = EmailAddress.objects.get(user_model=self.user_model)
+        token = email_verification_service.make_token(email_address_model)
+
+        with mock.patch(
+            "django.core.signing.time.time", return_value=time.time() + 3601
+        ):
+            response = self.verify(token)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(
+            EmailAddress.objects.get(id=email_address_model.id).is_verified
+        )
+
+    def test_tokens_of_claimed_addresses_are_rejected(self):
+        email_address_model = EmailAddress.objects.get(user_model=self.user_model)
+        token = email_verification_service.make_token(email_address_model)
+
+        # The unverified address moves to the new user, keeping its id.
+        UserFactory(username="mary", email="josh@example.com")
+
+        with self.assertNumQueries(1):
+            response = self.verify(token)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(
+            EmailAddress.objects.get(id=email_address_model.id).is_verified
+        )
+
+    def test_unverified_addresses_are_sent_new_tokens_in_batches(self):
+        job_service.run_pending()
+        mail.outbox.clear()
+
+        UserFactory(username="mary", email="mary@example.com")
+        verified = UserFactory(username="jeff", email="jeff@example.com")
+        EmailAddress.objects.filter(user_model=verified).update(is_verified=True)
+        deleted = UserFactory(username="john", email="john@example.com")
+        user_service.remove_user(deleted.id)
+
+        call_command("send_verification_emails", batch_size=1, stderr=mock.Mock())
+
+        self.assertEqual(
+            ["josh@example.com", "mary@example.com"],
+            sorted(message.to[0] for message in mail.outbox),
+        )
@@ -0,0 +1,105 @@
+import threading
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from community.models import Job
+from community.services import job_service
+
+
+@override_settings(JOB_MAX_ATTEMPTS=2)
+class JobTestCase(TestCase):
+    def setUp(self) -> None:
+        self.handler = mock.Mock()
+        job_service.register("test", self.handler)
+        self.addCleanup(job_service.handlers.pop, "test")
+
+    def test_failing_jobs_are_retried_later_then_kept_as_failed(self):
+        self.handler.side_effect = ValueError("Boom")
+        job = job_service.enqueue("test")
+
+        with self.assertLogs("community.services.job_service", "ERROR"):
+            self.assertEqual(1, job_service.run_pending())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("Boom", job.last_error)
+
+        # Not due before the backoff.
+        self.assertEqual(0, job_service.run_pending())
+
+        Job.objects.update(run_at=job.created_at)
+        with self.assertLogs("community.services.job_service", "ERROR"):
+            job_service.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(0, job_service.run_pending())
+
+    def test_deduplicated_jobs_are_enqueued_once_until_they_run(self):
+        job_service.enqueue("test", deduplicate=True, user_id=1)
+
+        self.assertIsNone(job_service.enqueue("test", deduplicate=True, user_id=1))
+        self.assertIsNotNone(job_service.enqueue("test", deduplicate=True, user_id=2))
+
+        job_service.run_pending()
+
+        self.assertIsNotNone(job_service.enqueue("test", deduplicate=True, user_id=1))
+
+    def test_unknown_jobs_can_not_be_enqueued(self):
+        with self.assertRaises(ValueError):
+            job_service.enqueue("unknown")
+
+
+class WorkerTestCase(TransactionTestCase):
+    # Workers use connections of their own, which only see committed jobs.
+
+    def setUp(self) -> None:
+        self.handler = mock.Mock()
+        job_service.register("test", self.handler)
+        self.addCleanup(job_service.handlers.pop, "test")
+
+    def test_jobs_run_once_and_are_deleted(self):
+        for user_id in range(10):
+            job_service.enqueue("test", user_id=user_id)
+
+        call_command("run_workers", "--burst", "--concurrency", "3")
+
+        self.assertEqual(
+            sorted(call.kwargs["user_id"] for call in self.handler.call_args_list),
+            list(range(10)),
+        )
+        self.assertFalse(Job.objects.exists())
+
+    def test_running_jobs_do_not_deduplicate_new_ones(self):
+        started = threading.Event()
+        finish = threading.Event()
+
+        def handler():
+            started.set()
+            finish.wait(5)
+
+        self.handler.side_effect = handler
+        job_service.enqueue("test")
+
+        def work():
+            try:
+                job_service.run_next()
+            finally:
+                connections.close_all()
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        try:
+            started.wait(5)
+            with transaction.atomic():
+                job = job_service.enqueue("test", deduplicate=True)
+        finally:
+            finish.set()
+            worker.join()
+
+        self.assertIsNotNone(job)
+        self.assertEqual([job.id], list(Job.objects.values_list("id", flat=True)))
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from rest_framework.test import APIRequestFactory
+
+import community.views.authorization_views
+from community.services import password_hashing_service
+from errors import domain_errors
+from utils.test_utils import *
+from utils.throttling_utils import reset_throttles
+
+
+class UserTestCase(TestCase):
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+        self.view = community.views.authorization_views.LogInView.as_view()
+        reset_throttles()
+
+        self.maxDiff = None
+
+    def test_valid_log_in(self):
+        UserFactory(username="josh", email="josh@example.com", password="pAssw0rd!")
+
+        post_request_data = {"username": "josh", "password": "pAssw0rd!"}
+
+        request = self.factory.post("/api/token/", data=post_request_data)
+
+        with self.assertNumQueries(1):
+            response = self.view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({"access", "refresh"}, set(response.data))
+
+    def test_wrong_password_is_rejected(self):
+        UserFactory(username="josh", email="josh@example.com", password="pAssw0rd!")
+
+        post_request_data = {"username": "josh", "password": "wrong"}
+
+        request = self.factory.post("/api/token/", data=post_request_data)
+
+        response = self.view(request)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_log_in_fails_fast_when_hashing_is_overloaded(self):
+        UserFactory(username="josh", email="josh@example.com", password="pAssw0rd!")
+
+        post_request_data = {"username": "josh", "password": "pAssw0rd!"}
+
+        request = self.factory.post("/api/token/", data=post_request_data)
+
+        with mock.patch.object(
+            password_hashing_service,
+            "_submit",
+            side_effect=domain_errors.ServiceOverloadedError(),
+        ):
+            response = self.view(request)
+
+        expected_response = {
+            "errors": {
+                "display_error": "The service is overloaded, please try again later.",
+                "internal_error_code": 50301,
+            }
+        }
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.data, expected_response)
@@ -1,9 +1,12 @@
 from django.test import TestCase
 
 from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
 import faker
 
 import community.views.user_views
+from community.authentication import ClaimsUser
+from community.services import user_service
 from utils.test_utils import *
 
 
@@ -12,6 +15,7 @@ class UserTestCase(TestCase):
         self.factory = APIRequestFactory()
         self.get_view = community.views.user_views.GetMeView.as_view()
         self.fake = faker.Faker()
+        user_service.profile_cache.clear()
 
         self.maxDiff = None
 
@@ -23,7 +27,7 @@ class UserTestCase(TestCase):
         request = self.factory.get("api/users/me/")
         force_authenticate(request, user_model)
 
-        with self.assertNumQueries(0):
+        with self.assertNumQueries(1):
             response = self.get_view(request)
 
         expected_response = {
@@ -49,3 +53,68 @@ class UserTestCase(TestCase):
 
         self.assertEqual(response.status_code, 401)
         self.assertEqual(response.data, expected_response)
+
+    def test_profile_is_current_rather_than_from_the_token(self):
+        user_model = UserFactory(
+            username=self.fake.user_name(),
+            email=self.fake.email(),
+            first_name="Josh",
+        )
+        access_token = user_service.create_access_token(user_model)["access"]
+
+        user_service.update_user_profile_by_id(user_model.id, safe_first_name="Jeff")
+
+        request = self.factory.get(
+            "api/users/me/", HTTP_AUTHORIZATION=f"Bearer {access_token}"
+        )
+
+        with self.assertNumQueries(1):
+            response = self.get_view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["first_name"], "Jeff")
+        self.assertEqual(response["ETag"], '"2"')
+
+        # The ETag of the token's version is stale.
+        request = self.factory.get(
+            "api/users/me/",
+            HTTP_AUTHORIZATION=f"Bearer {access_token}",
+            HTTP_IF_NONE_MATCH='"1"',
+        )
+        self.assertEqual(self.get_view(request).status_code, 200)
+
+    def test_claims_user_loads_the_user_on_first_access(self):
+        user_model = UserFactory(
+            username=self.fake.user_name(), email=self.fake.email()
+        )
+        access_token = user_service.create_access_token(user_model)["access"]
+
+        claims_user = ClaimsUser(AccessToken(access_token))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(claims_user.user_model, user_model)
+
+    def test_unchanged_profile_is_not_sent_again(self):
+        user_model = UserFactory(
+            username=self.fake.user_name(), email=self.fake.email()
+        )
+        access_token = user_service.create_access_token(user_model)["access"]
+
+        request = self.factory.get(
+            "api/users/me/", HTTP_AUTHORIZATION=f"Bearer {access_token}"
+        )
+        response = self.get_view(request)
+
+        self.assertEqual(response["ETag"], '"1"')
+
+        request = self.factory.get(
+            "api/users/me/",
+            HTTP_AUTHORIZATION=f"Bearer {access_token}",
+            HTTP_IF_NONE_MATCH='"1"',
+        )
+
+        with self.assertNumQueries(0):
+            response = self.get_view(request)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"1"')
@@ -0,0 +1,82 @@
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
+
+from errors import domain_errors
+from utils.error_utils import get_record_error
+from utils.test_utils import *
+
+
+class MetricsTestCase(TestCase):
+    def get_sample_value(self, name, labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_requests_are_counted_per_url_name(self):
+        labels = {"view_name": "sign-up", "method": "POST", "status": "201"}
+        before = self.get_sample_value(
+            "sports_http_request_duration_seconds_count", labels
+        )
+
+        post_request_data = {
+            "username": "josh",
+            "email": "josh@example.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+        }
+        self.client.post(
+            "/api/sign-up/", post_request_data, content_type="application/json"
+        )
+
+        self.assertEqual(
+            self.get_sample_value("sports_http_request_duration_seconds_count", labels),
+            before + 1,
+        )
+
+        response = self.client.get("/metrics/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            b'sports_http_request_db_duration_seconds_count{method="POST",'
+            b'view_name="sign-up"}',
+            response.content,
+        )
+        self.assertIn(
+            b'sports_password_hash_duration_seconds_count{operation="make"}',
+            response.content,
+        )
+
+    def test_domain_errors_are_counted_per_internal_code(self):
+        UserFactory(username="josh", email="josh@example.com")
+        labels = {"internal_code": "40901", "error": "UsernameAlreadyExistsError"}
+        before = self.get_sample_value("sports_domain_errors_total", labels)
+
+        post_request_data = {
+            "username": "josh",
+            "email": "other@example.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+        }
+        response = self.client.post(
+            "/api/sign-up/", post_request_data, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(
+            self.get_sample_value("sports_domain_errors_total", labels), before + 1
+        )
+
+    def test_record_errors_are_not_counted_as_error_responses(self):
+        labels = {"internal_code": "40901", "error": "UsernameAlreadyExistsError"}
+        before = self.get_sample_value("sports_domain_errors_total", labels)
+
+        # As for each failed record of an import or a bulk request.
+        get_record_error(0, domain_errors.UsernameAlreadyExistsError())
+
+        self.assertEqual(
+            self.get_sample_value("sports_domain_errors_total", labels), before
+        )
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"])
+    def test_metrics_are_only_exported_to_allowed_addresses(self):
+        response = self.client.get("/metrics/")
+
+        self.assertEqual(response.status_code, 404)
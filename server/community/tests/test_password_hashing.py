@@ -0,0 +1,76 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import hashers
+from django.test import TestCase, override_settings
+
+from community.services import password_hashing_service
+from community.services.password_hashing_service import PasswordHashingService
+from errors import domain_errors
+from utils.test_utils import UserFactory
+
+
+class PasswordHashingTestCase(TestCase):
+    @override_settings(
+        PASSWORD_HASHING_POOL="thread",
+        PASSWORD_HASHING_MAX_WORKERS=2,
+        PASSWORD_HASHING_MAX_QUEUE_DEPTH=0,
+        PASSWORD_HASHING_BULK_MAX_WORKERS=1,
+    )
+    def test_batch_hashing_leaves_slots_to_interactive_requests(self):
+        service = PasswordHashingService()
+        release = threading.Event()
+
+        def make_password(unsafe_password):
+            if unsafe_password == "bulk":
+                release.wait(5)
+            return unsafe_password
+
+        with mock.patch(
+            "community.services.password_hashing_service._make_password",
+            make_password,
+        ):
+            batch = threading.Thread(
+                target=service.make_passwords, args=(["bulk"] * 10,)
+            )
+            batch.start()
+            try:
+                # While the batch holds its slot and waits for more, log-ins
+                # and sign-ups still get a worker.
+                self.assertEqual("josh", service.make_password("josh"))
+                self.assertEqual("mary", service.make_password("mary"))
+            finally:
+                release.set()
+                batch.join()
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+            "django.contrib.auth.hashers.UnsaltedMD5PasswordHasher",
+        ]
+    )
+    def test_log_in_succeeds_when_the_hash_upgrade_is_overloaded(self):
+        user_model = UserFactory(
+            username="josh", email="josh@example.com", password="pAssw0rd!"
+        )
+        # Hashed with a hasher that is not the preferred one.
+        user_model.password = hashers.make_password("pAssw0rd!", hasher="unsalted_md5")
+        user_model.save(update_fields=["password"])
+        encoded = user_model.password
+
+        with mock.patch.object(
+            password_hashing_service,
+            "make_password",
+            side_effect=domain_errors.ServiceOverloadedError(),
+        ):
+            self.assertTrue(
+                password_hashing_service.check_password(user_model, "pAssw0rd!")
+            )
+
+        user_model.refresh_from_db()
+        self.assertEqual(user_model.password, encoded)
+
+        # Upgraded on the next log-in instead.
+        password_hashing_service.check_password(user_model, "pAssw0rd!")
+        user_model.refresh_from_db()
+        self.assertNotEqual(user_model.password, encoded)
@@ -0,0 +1,109 @@
+from unittest import mock
+
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, override_settings
+
+import community.views.async_views
+import community.views.user_views
+from community.models import User
+from community.services import user_service
+from utils.query_budget_utils import QueryBudgetMiddleware, query_budget_exceeded
+from utils.test_utils import *
+
+
+@override_settings(QUERY_BUDGET_SAMPLE_RATE=1.0)
+class QueryBudgetTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user_model = UserFactory(username="josh", email="josh@example.com")
+        self.access_token = user_service.create_access_token(self.user_model)["access"]
+        user_service.profile_cache.clear()
+
+    def get_profile(self):
+        return self.client.get(
+            f"/api/users/{self.user_model.id}/",
+            HTTP_AUTHORIZATION=f"Bearer {self.access_token}",
+        )
+
+    def test_views_over_their_budget_are_reported(self):
+        events = []
+
+        def receiver(sender, **kwargs):
+            events.append(kwargs)
+
+        query_budget_exceeded.connect(receiver)
+        self.addCleanup(query_budget_exceeded.disconnect, receiver)
+
+        with mock.patch.dict(
+            community.views.user_views.UserViewSet.query_budgets, {"get": 1}
+        ):
+            with self.assertLogs("utils.query_budget_utils", "WARNING"):
+                response = self.get_profile()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["view_name"], "user-detail")
+        self.assertEqual(events[0]["query_count"], 2)
+        self.assertEqual(events[0]["query_budget"], 1)
+
+    def test_views_within_their_budget_are_not_reported(self):
+        with self.assertNoLogs("utils.query_budget_utils", "WARNING"):
+            response = self.get_profile()
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(QUERY_BUDGET_SAMPLE_RATE=0.0)
+    def test_requests_that_are_not_sampled_are_not_checked(self):
+        with mock.patch.dict(
+            community.views.user_views.UserViewSet.query_budgets, {"get": 0}
+        ):
+            with self.assertNoLogs("utils.query_budget_utils", "WARNING"):
+                self.get_profile()
+
+    def test_repeated_queries_are_reported_as_n_plus_one(self):
+        user_ids = [
+            UserFactory(username=f"user{i}", email=f"user{i}@example.com").id
+            for i in range(5)
+        ]
+
+        def view(request):
+            for user_id in user_ids:
+                User.objects.filter(id=user_id).first()
+            return HttpResponse()
+
+        middleware = QueryBudgetMiddleware(view)
+
+        with self.assertLogs("utils.query_budget_utils", "WARNING") as logs:
+            middleware(RequestFactory().get("/"))
+
+        [(fingerprint, count)] = logs.records[0].repeated_queries
+        self.assertEqual(count, 5)
+        self.assertIn('FROM "community_user"', fingerprint)
+
+    @override_settings(DEBUG=True, SERVER_TIMING_ENABLED=True)
+    def test_middleware_is_not_adapted_under_asgi(self):
+        # Django logs every middleware it has to run in a thread for ASGI.
+        with self.assertNoLogs("django.request", "DEBUG"):
+            ASGIHandler()
+
+    async def test_queries_of_async_views_are_counted(self):
+        events = []
+
+        def receiver(sender, **kwargs):
+            events.append(kwargs)
+
+        query_budget_exceeded.connect(receiver)
+        self.addCleanup(query_budget_exceeded.disconnect, receiver)
+
+        with mock.patch.object(
+            community.views.async_views.user_detail, "query_budget", 0
+        ):
+            with self.assertLogs("utils.query_budget_utils", "WARNING"):
+                response = await AsyncClient().get(
+                    f"/api/async/users/{self.user_model.id}/",
+                    authorization=f"Bearer {self.access_token}",
+                )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(events[0]["view_name"], "async-user-detail")
+        self.assertEqual(events[0]["query_count"], 1)
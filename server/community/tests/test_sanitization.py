@@ -0,0 +1,74 @@
+import random
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from utils import sanitization_utils
+from utils.sanitization_utils import get_cleaner, strip_xss, strip_xss_from_fields
+
+PLAIN_TEXTS = [
+    "",
+    "josh",
+    "  Josh Papadopoulos  ",
+    "josh.p+sports@example.com",
+    "Γιώργος Θαρρόπουλος",
+    "O'Brien-Smith",
+    "tab\tand\nnewline",
+    "emoji 🏀 and ẞ",
+]
+MARKUP_TEXTS = [
+    "<b>Josh</b>",
+    "<script>alert(1)</script>",
+    "<img src=x onerror=alert(1)>",
+    "a < b > c",
+    "Tom & Jerry",
+    "&lt;b&gt;",
+    "<!-- comment -->name",
+    "Jo\x00sh",
+    "Jo\x1bsh",
+    "carriage\rreturn",
+    "nbsp\x85and\x9fc1",
+    "\x7fdelete",
+]
+
+
+class SanitizationTestCase(SimpleTestCase):
+    def clean(self, text):
+        return get_cleaner().clean(text).strip()
+
+    def test_fast_path_matches_the_cleaner_on_text_without_markup(self):
+        with mock.patch.object(
+            sanitization_utils, "get_cleaner", side_effect=AssertionError
+        ):
+            fast_results = [strip_xss(text) for text in PLAIN_TEXTS]
+
+        self.assertEqual(fast_results, [self.clean(text) for text in PLAIN_TEXTS])
+
+    def test_markup_and_control_characters_go_through_the_cleaner(self):
+        for text in MARKUP_TEXTS:
+            with self.subTest(text=text):
+                self.assertEqual(strip_xss(text), self.clean(text))
+
+        self.assertEqual(strip_xss("<b>Josh</b>"), "Josh")
+        self.assertEqual(strip_xss("<script>alert(1)</script>"), "alert(1)")
+        self.assertEqual(strip_xss("Tom & Jerry"), "Tom &amp; Jerry")
+
+    def test_fast_path_matches_the_cleaner_on_random_text(self):
+        alphabet = "ab Zé\t\n\r<>&;/=\"'!-\x00\x01\x0b\x1f\x7f\x85\x9f\xa0€🏀"
+        randomizer = random.Random(0)
+
+        for _ in range(2000):
+            text = "".join(
+                randomizer.choice(alphabet) for _ in range(randomizer.randint(0, 12))
+            )
+            with self.subTest(text=text):
+                self.assertEqual(strip_xss(text), self.clean(text))
+
+    def test_every_field_is_stripped(self):
+        self.assertEqual(
+            strip_xss_from_fields(
+                {"first_name": " <b>Josh</b> ", "last_name": "Papadopoulos "}
+            ),
+            {"first_name": "Josh", "last_name": "Papadopoulos"},
+        )
+        self.assertEqual(strip_xss_from_fields({}), {})
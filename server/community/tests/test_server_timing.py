@@ -0,0 +1,59 @@
+from django.test import TestCase, override_settings
+
+from community.services import user_service
+from utils.test_utils import *
+
+
+class ServerTimingTestCase(TestCase):
+    def get_phases(self, response):
+        return {
+            metric.split(";")[0] for metric in response["Server-Timing"].split(", ")
+        }
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_sign_up_reports_the_time_of_each_phase(self):
+        post_request_data = {
+            "username": "josh",
+            "email": "josh@example.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+        }
+
+        with self.assertLogs("utils.timing_utils", "INFO") as logs:
+            response = self.client.post(
+                "/api/sign-up/", post_request_data, content_type="application/json"
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            self.get_phases(response),
+            {
+                "authenticate",
+                "sanitize",
+                "validate",
+                "hash",
+                "insert_user",
+                "token",
+                "db",
+                "total",
+            },
+        )
+        self.assertEqual(logs.records[0].view_name, "sign-up")
+        self.assertIn("hash", logs.records[0].phases_ms)
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_token_authentication_is_reported(self):
+        user_model = UserFactory(username="josh", email="josh@example.com")
+        access_token = user_service.create_access_token(user_model)["access"]
+
+        response = self.client.get(
+            "/api/users/me/", HTTP_AUTHORIZATION=f"Bearer {access_token}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_phases(response), {"authenticate", "db", "total"})
+
+    def test_server_timing_is_disabled_by_default(self):
+        response = self.client.get("/api/users/me/")
+
+        self.assertNotIn("Server-Timing", response)
@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.test import TestCase
 
 from rest_framework.test import APIRequestFactory
@@ -5,15 +7,27 @@ import faker
 
 import community.views.authorization_views
 from utils.test_utils import *
+from utils.throttling_utils import reset_throttles
 from community.models import User
+from community.services import (
+    job_service,
+    password_hashing_service,
+    username_availability_service,
+)
 
 
 class UserTestCase(TestCase):
     def setUp(self) -> None:
         self.factory = APIRequestFactory()
         self.view = community.views.authorization_views.SignUpView.as_view()
+        reset_throttles()
         self.fake = faker.Faker()
 
+        # Sign-ups check the username against the filter that a running
+        # server builds at startup.
+        username_availability_service.rebuild()
+        self.addCleanup(username_availability_service.reset)
+
         self.maxDiff = None
 
     def test_valid_sign_up(self):
@@ -26,7 +40,7 @@ class UserTestCase(TestCase):
 
         request = self.factory.post("/api/sign-up/", data=post_request_data)
 
-        with self.assertNumQueries(15):
+        with self.assertNumQueries(6):
             self.view(request)
 
         user_model = User.objects.last()
@@ -248,9 +262,14 @@ class UserTestCase(TestCase):
 
         request = self.factory.post("/api/sing-up/", data=post_request_data)
 
-        with self.assertNumQueries(1):
+        # The username is checked before the password is hashed.
+        with mock.patch.object(
+            password_hashing_service, "make_password"
+        ) as make_password, self.assertNumQueries(1):
             response = self.view(request)
 
+        make_password.assert_not_called()
+
         expected_response = {
             "errors": {
                 "display_error": "An account with this username already exists.",
@@ -264,6 +283,27 @@ class UserTestCase(TestCase):
         self.assertEqual(1, User.objects.count())
         self.assertEqual(1, EmailAddress.objects.count())
 
+    def test_username_taken_after_the_check_is_rejected_by_the_database(self):
+        UserFactory(username="aoeu", email="example@example.com")
+
+        post_request_data = {
+            "username": "aoeu",
+            "email": "example2@example.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+        }
+
+        request = self.factory.post("/api/sign-up/", data=post_request_data)
+
+        with mock.patch.object(
+            username_availability_service, "is_available", return_value=True
+        ):
+            response = self.view(request)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["errors"]["internal_error_code"], 40901)
+        self.assertEqual(1, User.objects.count())
+
     def test_users_with_unverified_emails_get_deleted_by_new_signups(self):
         UserFactory(username="aoeu", email="example@example.com")
 
@@ -276,10 +316,87 @@ class UserTestCase(TestCase):
 
         request = self.factory.post("/api/sing-up/", data=post_request_data)
 
-        with self.assertNumQueries(17):
+        with self.assertNumQueries(6):
             response = self.view(request)
 
         self.assertEqual(response.status_code, 201)
 
+        # The previous owner is deleted by a background job.
+        self.assertEqual(2, User.objects.count())
+        job_service.run_pending()
+
+        self.assertEqual(1, User.objects.count())
+        self.assertEqual(1, EmailAddress.objects.count())
+
+    def test_user_cannot_create_an_account_with_a_verified_email_that_already_exists(
+        self,
+    ):
+        user_model = UserFactory(username="aoeu", email="example@example.com")
+        EmailAddress.objects.filter(user_model=user_model).update(is_verified=True)
+
+        post_request_data = {
+            "username": "username",
+            "email": "example@example.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+        }
+
+        request = self.factory.post("/api/sign-up/", data=post_request_data)
+
+        with self.assertNumQueries(6):
+            response = self.view(request)
+
+        expected_response = {
+            "errors": {
+                "display_error": "An account with this email address already exists.",
+                "internal_error_code": 40902,
+            }
+        }
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data, expected_response)
+
         self.assertEqual(1, User.objects.count())
         self.assertEqual(1, EmailAddress.objects.count())
+
+    def test_email_addresses_are_compared_case_insensitively(self):
+        user_model = UserFactory(username="aoeu", email="example@example.com")
+        EmailAddress.objects.filter(user_model=user_model).update(is_verified=True)
+
+        post_request_data = {
+            "username": "username",
+            "email": "Example@EXAMPLE.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+        }
+
+        request = self.factory.post("/api/sign-up/", data=post_request_data)
+
+        response = self.view(request)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["errors"]["internal_error_code"], 40902)
+        self.assertEqual(1, User.objects.count())
+
+    def test_unverified_emails_are_claimed_whatever_their_case(self):
+        UserFactory(username="aoeu", email="example@example.com")
+
+        post_request_data = {
+            "username": "username",
+            "email": "Example@Example.com",
+            "password": "pAssw0rd!",
+            "terms_of_service": True,
+        }
+
+        request = self.factory.post("/api/sign-up/", data=post_request_data)
+
+        with self.assertNumQueries(6):
+            response = self.view(request)
+
+        self.assertEqual(response.status_code, 201)
+
+        job_service.run_pending()
+
+        self.assertEqual(["username"], [u.username for u in User.objects.all()])
+        email_address_model = EmailAddress.objects.get()
+        self.assertEqual(email_address_model.normalized_email, "example@example.com")
@@ -0,0 +1,84 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from community.views.authorization_views import LogInView, SignUpView
+from utils.test_utils import *
+from utils.throttling_utils import TokenBucketLimiter, reset_throttles
+
+
+@override_settings(
+    THROTTLE_RATES={
+        "log_in": {"ip": "5/min", "username": "2/min"},
+        "sign_up": {"ip": "5/min", "email": "1/min"},
+    }
+)
+class ThrottlingTestCase(TestCase):
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+        self.log_in_view = LogInView.as_view()
+        self.sign_up_view = SignUpView.as_view()
+
+        reset_throttles()
+        self.addCleanup(reset_throttles)
+
+    def log_in(self, username, remote_addr="10.0.0.1"):
+        request = self.factory.post(
+            "/api/token/",
+            data={"username": username, "password": "wrong"},
+            REMOTE_ADDR=remote_addr,
+        )
+        return self.log_in_view(request)
+
+    def test_log_in_is_throttled_per_username_without_queries(self):
+        UserFactory(username="josh", email="josh@example.com")
+
+        for remote_addr in ("10.0.0.1", "10.0.0.2"):
+            self.assertEqual(self.log_in("josh", remote_addr).status_code, 401)
+
+        with self.assertNumQueries(0):
+            response = self.log_in("JOSH", "10.0.0.3")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.data["errors"]["internal_error_code"], 42902)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+        # Other usernames are still let through.
+        self.assertEqual(self.log_in("maria").status_code, 401)
+
+    def test_log_in_is_throttled_per_ip(self):
+        for i in range(5):
+            self.assertEqual(self.log_in(f"user{i}").status_code, 401)
+
+        self.assertEqual(self.log_in("user5").status_code, 429)
+        self.assertEqual(self.log_in("user5", "10.0.0.2").status_code, 401)
+
+    def test_sign_up_is_throttled_per_email(self):
+        for username in ("josh", "joshua"):
+            request = self.factory.post(
+                "/api/sign-up/",
+                data={
+                    "username": username,
+                    "email": "josh@example.com",
+                    "password": "pAssw0rd!",
+                    "terms_of_service": True,
+                },
+            )
+            response = self.sign_up_view(request)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.data["errors"]["internal_error_code"], 42902)
+
+
+class TokenBucketLimiterTestCase(TestCase):
+    def test_bucket_refills_over_time(self):
+        limiter = TokenBucketLimiter("2/s")
+
+        self.assertEqual(limiter.consume("key"), 0)
+        self.assertEqual(limiter.consume("key"), 0)
+        self.assertGreater(limiter.consume("key"), 0)
+
+        # Pretend a second has passed.
+        tokens, updated_at = limiter._buckets["key"]
+        limiter._buckets["key"] = (tokens, updated_at - 1)
+
+        self.assertEqual(limiter.consume("key"), 0)
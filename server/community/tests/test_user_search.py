@@ -0,0 +1,87 @@
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from community.views.user_views import UserViewSet
+from utils.test_utils import *
+
+
+class UserSearchTestCase(TestCase):
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+        self.search_view = UserViewSet.as_view({"get": "search"})
+
+        self.user_model = UserFactory(
+            username="josh",
+            email="josh@example.com",
+            first_name="Joshua",
+            last_name="Papadopoulos",
+        )
+        UserFactory(
+            username="maria",
+            email="maria@example.com",
+            first_name="Maria",
+            last_name="Georgiou",
+        )
+        UserFactory(
+            username="georgos",
+            email="georgos@example.com",
+            first_name="Georgios",
+            last_name="Tharropoulos",
+        )
+
+    def search(self, **params):
+        request = self.factory.get("/api/users/search/", data=params)
+        force_authenticate(request, self.user_model)
+        return self.search_view(request)
+
+    def get_usernames(self, response):
+        return [profile["username"] for profile in response.data["data"]]
+
+    def test_prefix_search_matches_the_start_of_any_field(self):
+        with self.assertNumQueries(1):
+            response = self.search(q="Geo", mode="prefix")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(self.get_usernames(response)), {"maria", "georgos"})
+
+    def test_fuzzy_search_tolerates_typos_and_ranks_by_similarity(self):
+        response = self.search(q="Papadopolous")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_usernames(response)[0], "josh")
+
+    def test_search_is_paginated(self):
+        response = self.search(q="geo", mode="prefix", limit=1)
+
+        self.assertEqual(len(response.data["data"]), 1)
+        self.assertIn("offset=1", response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+        second_response = self.search(q="geo", mode="prefix", limit=1, offset=1)
+
+        self.assertEqual(len(second_response.data["data"]), 1)
+        self.assertIsNone(second_response.data["next"])
+        self.assertNotEqual(
+            self.get_usernames(response), self.get_usernames(second_response)
+        )
+
+    def test_invalid_search_is_rejected(self):
+        response = self.search(q="josh", mode="exact")
+
+        self.assertEqual(response.status_code, 422)
+
+        response = self.search()
+
+        self.assertEqual(response.status_code, 422)
+
+    def test_queries_shorter_than_a_trigram_are_rejected(self):
+        for q in ["jo", "   ", "  jo  "]:
+            with self.assertNumQueries(0):
+                response = self.search(q=q, mode="prefix")
+
+            self.assertEqual(response.status_code, 422)
+
+        response = self.search(q="  jos  ", mode="prefix")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_usernames(response), ["josh"])
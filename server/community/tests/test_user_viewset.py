@@ -1,11 +1,15 @@
-from django.test import TestCase
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
 
 from rest_framework.test import APIRequestFactory, force_authenticate
 import faker
 
 import community.views.user_views
 from utils.test_utils import *
-from community.models import User
+from community.models import Job, User
+from community.services import job_service, user_service
 
 
 class UserTestCase(TestCase):
@@ -15,10 +19,12 @@ class UserTestCase(TestCase):
             {"delete": "delete"}
         )
         self.update_view = community.views.user_views.UserViewSet.as_view(
-            {"put": "update"}
+            {"put": "update", "patch": "partial_update"}
         )
         self.get_view = community.views.user_views.UserViewSet.as_view({"get": "get"})
+        self.list_view = community.views.user_views.UserViewSet.as_view({"get": "list"})
         self.fake = faker.Faker()
+        user_service.profile_cache.clear()
 
         self.maxDiff = None
 
@@ -33,14 +39,92 @@ class UserTestCase(TestCase):
         request = self.factory.delete(f"/api/users/{user_id}/")
         force_authenticate(request, admin)
 
-        with self.assertNumQueries(9):
+        # The user is only marked as deleted, and purged by a job enqueued in
+        # the same transaction, here a savepoint.
+        with self.assertNumQueries(5):
             response = self.delete_view(request, user_id)
 
         self.assertEqual(response.status_code, 204)
 
         self.assertEqual(1, User.objects.count())
+        self.assertEqual(2, EmailAddress.objects.count())
+
+        job_service.run_pending()
+
+        self.assertEqual(1, User.all_objects.count())
         self.assertEqual(1, EmailAddress.objects.count())
 
+    def test_admin_can_delete_user_through_the_api(self):
+        admin = UserFactory(
+            username="aoeu", email="example@example.com", is_admin=True, is_staff=True
+        )
+        user_model = UserFactory(username="todelete", email="delete@example.com")
+        access_token = user_service.create_access_token(admin)["access"]
+
+        response = self.client.delete(
+            f"/api/users/{user_model.id}/",
+            HTTP_AUTHORIZATION=f"Bearer {access_token}",
+        )
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(user_service.does_user_exists(user_model.id))
+
+        response = self.client.delete(
+            f"/api/users/{admin.id}/", HTTP_AUTHORIZATION=f"Bearer {access_token}"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(user_service.does_user_exists(admin.id))
+
+    def test_many_users_can_be_removed_at_once(self):
+        josh = UserFactory(username="josh", email="josh@example.com")
+        jeff = UserFactory(username="jeff", email="jeff@example.com")
+        UserFactory(username="john", email="john@example.com")
+
+        with self.assertNumQueries(5):
+            removed_user_ids = user_service.remove_users([josh.id, jeff.id, 10000])
+
+        self.assertEqual(sorted(removed_user_ids), sorted([josh.id, jeff.id]))
+        self.assertEqual(1, User.objects.count())
+        self.assertFalse(user_service.does_user_exists(josh.id))
+
+        # Removing them again is a no-op.
+        self.assertEqual([], user_service.remove_users([josh.id]))
+
+    def test_removals_share_the_waiting_purge(self):
+        josh = UserFactory(username="josh", email="josh@example.com")
+        jeff = UserFactory(username="jeff", email="jeff@example.com")
+
+        user_service.remove_users([josh.id])
+        user_service.remove_users([jeff.id])
+
+        self.assertEqual(1, Job.objects.filter(name="purge_deleted_users").count())
+
+    def test_users_are_not_removed_when_the_purge_cannot_be_enqueued(self):
+        josh = UserFactory(username="josh", email="josh@example.com")
+
+        with mock.patch.object(
+            job_service, "enqueue", side_effect=DatabaseError
+        ), self.assertRaises(DatabaseError):
+            user_service.remove_users([josh.id])
+
+        self.assertTrue(user_service.does_user_exists(josh.id))
+
+    @override_settings(USER_PURGE_BATCH_SIZE=2, USER_PURGE_PAUSE_SECONDS=0)
+    def test_deleted_users_are_purged_in_batches(self):
+        for i in range(5):
+            UserFactory(username=f"user{i}", email=f"user{i}@example.com")
+        # Sends the verification emails of the new users.
+        job_service.run_pending()
+
+        user_service.remove_users(list(User.objects.values_list("id", flat=True)))
+
+        # A job per batch, the full ones enqueueing the next.
+        self.assertEqual(3, job_service.run_pending())
+
+        self.assertEqual(0, User.all_objects.count())
+        self.assertEqual(0, EmailAddress.objects.count())
+
     def test_admin_cannot_delete_user_that_does_not_exists(self):
         admin = UserFactory(
             username="admin", email="example@example.com", is_admin=True, is_staff=True
@@ -49,7 +133,7 @@ class UserTestCase(TestCase):
         request = self.factory.delete("/api/users/10000/")
         force_authenticate(request, admin)
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(3):
             response = self.delete_view(request, 10000)
 
         expected_response = {
@@ -133,7 +217,7 @@ class UserTestCase(TestCase):
         request = self.factory.put(f"api/users/{user_model.id}", data=put_request_data)
         force_authenticate(request, user_model)
 
-        with self.assertNumQueries(8):
+        with self.assertNumQueries(1):
             response = self.update_view(request, user_model.id)
 
         user_model.refresh_from_db()
@@ -163,7 +247,7 @@ class UserTestCase(TestCase):
         request = self.factory.put(f"api/users/{user_model.id}", data=put_request_data)
         force_authenticate(request, user_model)
 
-        with self.assertNumQueries(8):
+        with self.assertNumQueries(1):
             response = self.update_view(request, user_model.id)
 
         user_model.refresh_from_db()
@@ -203,7 +287,7 @@ class UserTestCase(TestCase):
             "detail": "You do not have permission to perform this action."
         }
 
-        with self.assertNumQueries(2):
+        with self.assertNumQueries(0):
             response = self.update_view(request, josh.id)
 
         self.assertEqual(response.status_code, 403)
@@ -235,7 +319,7 @@ class UserTestCase(TestCase):
         request = self.factory.put(f"api/users/{user_model.id}", data=put_request_data)
         force_authenticate(request, admin_user_model)
 
-        with self.assertNumQueries(8):
+        with self.assertNumQueries(1):
             response = self.update_view(request, user_model.id)
 
         user_model.refresh_from_db()
@@ -245,6 +329,81 @@ class UserTestCase(TestCase):
         self.assertEqual(user_model.last_name, "changed_last_name")
         self.assertEqual(user_model.username, "changed_username")
 
+    def test_user_can_patch_their_profile(self):
+        user_model = UserFactory(
+            username="josh", email="josh@example.com", first_name="Josh"
+        )
+
+        request = self.factory.patch(
+            f"api/users/{user_model.id}", data={"last_name": "Maxwell"}
+        )
+        force_authenticate(request, user_model)
+
+        with self.assertNumQueries(1):
+            response = self.update_view(request, user_model.id)
+
+        user_model.refresh_from_db()
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(user_model.first_name, "Josh")
+        self.assertEqual(user_model.last_name, "Maxwell")
+
+    def test_user_cant_take_a_username_that_is_already_taken(self):
+        UserFactory(username="jeff", email="jeff@example.com")
+        user_model = UserFactory(username="josh", email="josh@example.com")
+
+        request = self.factory.put(
+            f"api/users/{user_model.id}",
+            data={"username": "jeff", "first_name": "Jeff"},
+        )
+        force_authenticate(request, user_model)
+
+        expected_response = {
+            "errors": {
+                "display_error": "An account with this username already exists.",
+                "internal_error_code": 40901,
+            }
+        }
+
+        with self.assertNumQueries(2):
+            response = self.update_view(request, user_model.id)
+
+        user_model.refresh_from_db()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data, expected_response)
+        self.assertEqual(user_model.username, "josh")
+        self.assertNotEqual(user_model.first_name, "Jeff")
+
+    def test_updating_a_profile_with_its_current_values_is_a_no_op(self):
+        user_model = UserFactory(
+            username="josh", email="josh@example.com", first_name="Josh"
+        )
+
+        request = self.factory.put(
+            f"api/users/{user_model.id}",
+            data={"username": "josh", "first_name": "Josh"},
+        )
+        force_authenticate(request, user_model)
+
+        with self.assertNumQueries(2):
+            response = self.update_view(request, user_model.id)
+
+        self.assertEqual(response.status_code, 204)
+
+    def test_admin_cant_update_user_that_does_not_exists(self):
+        admin_user_model = UserFactory(
+            username="admin", email="admin@example.com", is_superuser=True
+        )
+
+        request = self.factory.put("api/users/999", data={"first_name": "Josh"})
+        force_authenticate(request, admin_user_model)
+
+        with self.assertNumQueries(2):
+            response = self.update_view(request, 999)
+
+        self.assertEqual(response.status_code, 404)
+
     def test_can_retrieve_user_profile_successfully(self):
         UserFactory(
             username="josh",
@@ -258,7 +417,7 @@ class UserTestCase(TestCase):
         request = self.factory.get(f"api/users/{user_model.id}")
         force_authenticate(request, user_model)
 
-        with self.assertNumQueries(2):
+        with self.assertNumQueries(1):
             response = self.get_view(request, user_model.id)
 
         expected_response = {
@@ -295,7 +454,7 @@ class UserTestCase(TestCase):
         request = self.factory.get(f"api/users/{user_model_to_retrieve.id}")
         force_authenticate(request, user_model)
 
-        with self.assertNumQueries(2):
+        with self.assertNumQueries(1):
             response = self.get_view(request, user_model_to_retrieve.id)
 
         expected_response = {
@@ -337,3 +496,224 @@ class UserTestCase(TestCase):
 
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.data, expected_response)
+
+    def test_admin_can_page_through_users(self):
+        admin_model = UserFactory(
+            username="admin", email="admin@example.com", is_staff=True
+        )
+        for i in range(4):
+            UserFactory(username=f"user{i}", email=f"user{i}@example.com")
+
+        usernames = []
+        url = "api/users/?page_size=2"
+
+        while url:
+            request = self.factory.get(url)
+            force_authenticate(request, admin_model)
+
+            with self.assertNumQueries(1):
+                response = self.list_view(request)
+
+            self.assertEqual(response.status_code, 200)
+            usernames += [profile["username"] for profile in response.data["data"]]
+            url = response.data["next"]
+
+        self.assertEqual(usernames, ["admin", "user0", "user1", "user2", "user3"])
+
+    def test_admin_can_filter_users(self):
+        admin_model = UserFactory(
+            username="admin", email="admin@example.com", is_staff=True
+        )
+        josh = UserFactory(username="josh", email="josh@example.com")
+        UserFactory(username="jeff", email="jeff@example.com", is_active=False)
+        EmailAddress.objects.filter(user_model=josh).update(is_verified=True)
+
+        request = self.factory.get("api/users/?is_staff=false&is_verified=true")
+        force_authenticate(request, admin_model)
+
+        with self.assertNumQueries(1):
+            response = self.list_view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [profile["username"] for profile in response.data["data"]], ["josh"]
+        )
+
+        request = self.factory.get("api/users/?is_active=false")
+        force_authenticate(request, admin_model)
+
+        response = self.list_view(request)
+
+        self.assertEqual(
+            [profile["username"] for profile in response.data["data"]], ["jeff"]
+        )
+
+    def test_list_filters_must_be_booleans(self):
+        admin_model = UserFactory(
+            username="admin", email="admin@example.com", is_staff=True
+        )
+
+        request = self.factory.get("api/users/?is_staff=maybe")
+        force_authenticate(request, admin_model)
+
+        with self.assertNumQueries(0):
+            response = self.list_view(request)
+
+        expected_response = {
+            "errors": {
+                "display_error": "",
+                "field_errors": {"is_staff": ["Not a valid boolean."]},
+            }
+        }
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.data, expected_response)
+
+    def test_only_admins_can_list_users(self):
+        user_model = UserFactory(username="josh", email="josh@example.com")
+
+        request = self.factory.get("api/users/")
+        force_authenticate(request, user_model)
+
+        with self.assertNumQueries(0):
+            response = self.list_view(request)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_user_profile_is_served_from_the_cache_until_it_changes(self):
+        user_model = UserFactory(
+            username="josh",
+            email="josh@example.com",
+            first_name="Josh",
+            last_name="Maxwell",
+        )
+
+        request = self.factory.get(f"api/users/{user_model.id}")
+        force_authenticate(request, user_model)
+
+        with self.assertNumQueries(1):
+            self.get_view(request, user_model.id)
+
+        with self.assertNumQueries(0):
+            response = self.get_view(request, user_model.id)
+
+        self.assertEqual(response.data["data"]["first_name"], "Josh")
+
+        request = self.factory.put(
+            f"api/users/{user_model.id}", data={"first_name": "Jeff"}
+        )
+        force_authenticate(request, user_model)
+        self.update_view(request, user_model.id)
+
+        request = self.factory.get(f"api/users/{user_model.id}")
+        force_authenticate(request, user_model)
+
+        with self.assertNumQueries(1):
+            response = self.get_view(request, user_model.id)
+
+        self.assertEqual(response.data["data"]["first_name"], "Jeff")
+        self.assertEqual(
+            user_service.profile_cache.get_stats(),
+            {"hits": 1, "misses": 2, "hit_rate": 1 / 3},
+        )
+
+    def test_zero_padded_ids_share_the_cached_profile(self):
+        user_model = UserFactory(
+            username="josh", email="josh@example.com", first_name="Josh"
+        )
+        padded_id = f"0{user_model.id}"
+
+        request = self.factory.get(f"api/users/{padded_id}")
+        force_authenticate(request, user_model)
+        self.get_view(request, padded_id)
+
+        request = self.factory.put(
+            f"api/users/{user_model.id}", data={"first_name": "Jeff"}
+        )
+        force_authenticate(request, user_model)
+        self.update_view(request, str(user_model.id))
+
+        request = self.factory.get(f"api/users/{padded_id}")
+        force_authenticate(request, user_model)
+        response = self.get_view(request, padded_id)
+
+        self.assertEqual(response.data["data"]["first_name"], "Jeff")
+
+    def test_profile_is_only_sent_again_when_it_changes(self):
+        user_model = UserFactory(username="josh", email="josh@example.com")
+
+        request = self.factory.get(f"api/users/{user_model.id}")
+        force_authenticate(request, user_model)
+        response = self.get_view(request, user_model.id)
+
+        etag = response["ETag"]
+
+        user_service.profile_cache.clear()
+        request = self.factory.get(
+            f"api/users/{user_model.id}", HTTP_IF_NONE_MATCH=etag
+        )
+        force_authenticate(request, user_model)
+
+        # Only the version is looked up.
+        with self.assertNumQueries(1):
+            response = self.get_view(request, user_model.id)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        user_service.update_user_profile_by_id(user_model.id, safe_first_name="Josh")
+
+        request = self.factory.get(
+            f"api/users/{user_model.id}", HTTP_IF_NONE_MATCH=etag
+        )
+        force_authenticate(request, user_model)
+        response = self.get_view(request, user_model.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["first_name"], "Josh")
+        self.assertNotEqual(response["ETag"], etag)
+
+        # A cached profile answers without queries.
+        request = self.factory.get(
+            f"api/users/{user_model.id}", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        force_authenticate(request, user_model)
+
+        with self.assertNumQueries(0):
+            response = self.get_view(request, user_model.id)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_update_with_if_match_only_applies_to_the_current_version(self):
+        user_model = UserFactory(username="josh", email="josh@example.com")
+
+        request = self.factory.patch(
+            f"api/users/{user_model.id}",
+            data={"first_name": "Josh"},
+            HTTP_IF_MATCH='"1"',
+        )
+        force_authenticate(request, user_model)
+
+        with self.assertNumQueries(1):
+            response = self.update_view(request, user_model.id)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response["ETag"], '"2"')
+
+        # A second client still holding version 1.
+        request = self.factory.patch(
+            f"api/users/{user_model.id}",
+            data={"first_name": "Joshua"},
+            HTTP_IF_MATCH='"1"',
+        )
+        force_authenticate(request, user_model)
+
+        with self.assertNumQueries(2):
+            response = self.update_view(request, user_model.id)
+
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response.data["errors"]["internal_error_code"], 41201)
+
+        user_model.refresh_from_db()
+        self.assertEqual(user_model.first_name, "Josh")
+        self.assertEqual(user_model.version, 2)
@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from community.models import User
+from community.services import user_service, username_availability_service
+from community.views.user_views import UsernameAvailabilityView
+from utils.bloom_utils import BloomFilter
+from utils.test_utils import *
+
+
+class UsernameAvailabilityTestCase(TestCase):
+    def setUp(self) -> None:
+        self.factory = APIRequestFactory()
+        self.view = UsernameAvailabilityView.as_view()
+
+        self.user_model = UserFactory(username="josh", email="josh@example.com")
+
+        # As the server does at startup.
+        username_availability_service.rebuild()
+        self.addCleanup(username_availability_service.reset)
+
+    def check(self, username):
+        request = self.factory.get(
+            "/api/usernames/available/", data={"username": username}
+        )
+        return self.view(request)
+
+    def test_free_username_is_answered_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self.check("maria")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data, {"data": {"username": "maria", "available": True}}
+        )
+
+    def test_taken_username_is_confirmed_by_the_database(self):
+        with self.assertNumQueries(1):
+            response = self.check("josh")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["data"]["available"])
+
+    def test_invalid_username_is_rejected(self):
+        response = self.check("1josh")
+
+        self.assertEqual(response.status_code, 422)
+
+    def test_filter_follows_user_service_changes(self):
+        user_model, _ = user_service.create_user(
+            "maria", "Pass1234!", "maria@example.com", True
+        )
+        self.assertFalse(self.check("maria").data["data"]["available"])
+
+        user_service.update_user_profile_by_id(user_model.id, safe_username="mary")
+        self.assertTrue(self.check("maria").data["data"]["available"])
+        self.assertFalse(self.check("mary").data["data"]["available"])
+
+        # Deleted users keep their usernames until they are purged.
+        user_service.remove_user(user_model.id)
+        self.assertFalse(self.check("mary").data["data"]["available"])
+
+        user_service.purge_deleted_users()
+        self.assertTrue(self.check("mary").data["data"]["available"])
+
+    def test_filter_picks_up_users_created_elsewhere(self):
+        # Written by another process, bypassing the service.
+        User.objects.create(username="maria", email="maria@example.com")
+
+        username_availability_service.update()
+
+        with self.assertNumQueries(1):
+            self.assertFalse(self.check("maria").data["data"]["available"])
+
+    def test_checks_query_until_the_filter_is_built(self):
+        username_availability_service.reset()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(self.check("maria").data["data"]["available"])
+        with self.assertNumQueries(1):
+            self.assertFalse(self.check("josh").data["data"]["available"])
+
+    def test_usernames_taken_during_a_rebuild_are_kept(self):
+        original_get_users_after = username_availability_service._get_users_after
+
+        def get_users_after(user_id):
+            # A sign-up in another thread, after the scan read the table.
+            rows = list(original_get_users_after(user_id))
+            User.objects.create(username="maria", email="maria@example.com")
+            username_availability_service.add(["maria"])
+            return iter(rows)
+
+        with mock.patch.object(
+            username_availability_service, "_get_users_after", get_users_after
+        ):
+            username_availability_service.rebuild()
+
+        # Missing from the filter, it would be reported free without a query.
+        with self.assertNumQueries(1):
+            self.assertFalse(username_availability_service.is_available("maria"))
+
+    @override_settings(USERNAME_FILTER_MAX_STALE_RATIO=0)
+    def test_stale_filters_are_rebuilt_on_update(self):
+        user_service.update_user_profile_by_id(self.user_model.id, safe_username="mary")
+
+        username_availability_service.update()
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.check("josh").data["data"]["available"])
+
+
+class BloomFilterTestCase(TestCase):
+    def test_has_no_false_negatives_and_few_false_positives(self):
+        bloom_filter = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom_filter.add(f"user{i}")
+
+        self.assertTrue(all(f"user{i}" in bloom_filter for i in range(1000)))
+
+        false_positives = sum(f"other{i}" in bloom_filter for i in range(10_000))
+        self.assertLess(false_positives, 300)
@@ -3,8 +3,18 @@ from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework.routers import SimpleRouter
 
 
+from community.views import async_views
+from community.views.email_address_views import (
+    EmailAddressViewSet,
+    EmailVerificationView,
+)
 from community.views.authorization_views import LogInView, SignUpView
-from community.views.user_views import UserViewSet, GetMeView
+from community.views.user_views import (
+    BulkUserCreationView,
+    GetMeView,
+    UsernameAvailabilityView,
+    UserViewSet,
+)
 
 router = SimpleRouter()
 router.register("users", UserViewSet, basename="user")
@@ -14,6 +24,36 @@ urlpatterns = [
     path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
     path("sign-up/", SignUpView.as_view(), name="sign-up"),
     path("users/me/", GetMeView.as_view(), name="me"),
+    path("users/bulk/", BulkUserCreationView.as_view(), name="user-bulk-create"),
+    path(
+        "usernames/available/",
+        UsernameAvailabilityView.as_view(),
+        name="username-availability",
+    ),
+    path(
+        "users/<int:user_pk>/emails/",
+        EmailAddressViewSet.as_view({"get": "list", "post": "create"}),
+        name="user-email-list",
+    ),
+    path(
+        "users/<int:user_pk>/emails/<int:pk>/",
+        EmailAddressViewSet.as_view({"delete": "destroy"}),
+        name="user-email-detail",
+    ),
+    path(
+        "users/<int:user_pk>/emails/<int:pk>/verify/",
+        EmailAddressViewSet.as_view({"post": "verify"}),
+        name="user-email-verify",
+    ),
+    path(
+        "users/<int:user_pk>/emails/<int:pk>/primary/",
+        EmailAddressViewSet.as_view({"post": "promote"}),
+        name="user-email-promote",
+    ),
+    path("emails/verify/", EmailVerificationView.as_view(), name="email-verify"),
+    path("async/sign-up/", async_views.sign_up, name="async-sign-up"),
+    path("async/users/me/", async_views.get_me, name="async-me"),
+    path("async/users/<int:pk>/", async_views.user_detail, name="async-user-detail"),
 ]
 
 urlpatterns += router.urls
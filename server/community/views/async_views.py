@@ -0,0 +1,248 @@
+"""Async counterparts of the community views, for deployments served via ASGI.
+
+DRF views are synchronous, so these are plain Django views that reuse the same
+services, error shapes and status codes. Database access goes through the
+service's `a*` methods and blocking work runs in the bounded executor of
+`utils.async_utils`.
+"""
+import json
+import math
+
+import marshmallow
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+)
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+
+from community.authentication import ClaimsUser, JWTTokenUserAuthentication
+from community.services import user_service
+from errors import domain_errors
+from utils.async_utils import async_csrf_exempt, run_blocking
+from utils.conditional_utils import get_etag, get_if_match_versions
+from utils.error_utils import (
+    count_domain_error_response,
+    get_business_requirement_errors,
+    get_validation_errors,
+)
+from utils.sanitization_utils import string_to_boolean, strip_xss_from_fields
+from utils.throttling_utils import get_client_ip, throttle
+
+
+def authenticate(request: HttpRequest) -> ClaimsUser:
+    """Return the user of the request's access token without a query."""
+
+    result = JWTTokenUserAuthentication().authenticate(request)
+    if result is None:
+        raise NotAuthenticated()
+
+    return result[0]
+
+
+def get_exception_response(exc: APIException) -> HttpResponse:
+    data = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+    return JsonResponse(data, status=exc.status_code)
+
+
+def get_validation_error_response(
+    validation_error: marshmallow.ValidationError, http_status_code: int
+) -> HttpResponse:
+    resp = {"errors": get_validation_errors(validation_error)}
+    return JsonResponse(resp, status=http_status_code)
+
+
+def get_business_requirement_error_response(
+    business_logic_error: domain_errors.IBusinessError, http_status_code: int
+) -> HttpResponse:
+    count_domain_error_response(business_logic_error)
+    resp = {"errors": get_business_requirement_errors(business_logic_error)}
+    return JsonResponse(resp, status=http_status_code)
+
+
+def load_json(request: HttpRequest) -> dict:
+    data = json.loads(request.body or b"{}")
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object.")
+
+    return data
+
+
+@async_csrf_exempt
+async def sign_up(request: HttpRequest) -> HttpResponse:
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    try:
+        request_data = load_json(request)
+    except ValueError as e:
+        return JsonResponse({"detail": f"JSON parse error - {e}"}, status=400)
+
+    unsafe_fields = {
+        key: request_data.get(key, "")
+        for key in ("first_name", "last_name", "username", "email")
+    }
+    unsafe_terms_of_service = request_data.get("terms_of_service", None)
+    unsafe_password = request_data.get("password", "")
+
+    try:
+        throttle(
+            "sign_up",
+            ip=get_client_ip(request),
+            username=unsafe_fields["username"],
+            email=unsafe_fields["email"],
+        )
+    except domain_errors.TooManyRequestsError as e:
+        response = get_business_requirement_error_response(
+            e, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        response["Retry-After"] = str(math.ceil(e.retry_after))
+        return response
+
+    safe_fields = await run_blocking(strip_xss_from_fields, unsafe_fields)
+    safe_terms_of_service = string_to_boolean(unsafe_terms_of_service)
+
+    try:
+        user_model, auth_token = await user_service.acreate_user(
+            safe_username=safe_fields["username"],
+            unsafe_password=unsafe_password,
+            safe_email=safe_fields["email"],
+            safe_terms_of_service=safe_terms_of_service,
+            safe_first_name=safe_fields["first_name"],
+            safe_last_name=safe_fields["last_name"],
+        )
+    except marshmallow.ValidationError as e:
+        return get_validation_error_response(e, status.HTTP_422_UNPROCESSABLE_ENTITY)
+    except domain_errors.UsernameAlreadyExistsError as e:
+        return get_business_requirement_error_response(e, status.HTTP_409_CONFLICT)
+    except domain_errors.EmailAddressAlreadyExistsError as e:
+        return get_business_requirement_error_response(e, status.HTTP_409_CONFLICT)
+    except domain_errors.TermsNotAcceptedError as e:
+        return get_business_requirement_error_response(
+            e, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+    except domain_errors.ServiceOverloadedError as e:
+        return get_business_requirement_error_response(
+            e, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    resp = {"data": {"auth_token": auth_token, "user_id": user_model.id}}
+    return JsonResponse(resp, status=status.HTTP_201_CREATED)
+
+
+sign_up.query_budget = 4
+
+
+async def get_me(request: HttpRequest) -> HttpResponse:
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    try:
+        user = authenticate(request)
+    except APIException as e:
+        return get_exception_response(e)
+
+    # Only the user id comes from the token, so that the profile is current.
+    try:
+        resp = await user_service.aget_user_profile_by_id(user.id)
+    except domain_errors.UserDoesNotExistsError as e:
+        return get_business_requirement_error_response(e, status.HTTP_404_NOT_FOUND)
+
+    return JsonResponse({"data": resp}, status=status.HTTP_200_OK)
+
+
+get_me.query_budget = 1
+
+
+@async_csrf_exempt
+async def user_detail(request: HttpRequest, pk: int) -> HttpResponse:
+    if request.method not in ("GET", "PUT", "DELETE"):
+        return HttpResponseNotAllowed(["GET", "PUT", "DELETE"])
+
+    try:
+        user = authenticate(request)
+    except APIException as e:
+        return get_exception_response(e)
+
+    if request.method == "GET":
+        try:
+            resp = await user_service.aget_user_profile_by_id(user_id=pk)
+        except domain_errors.UserDoesNotExistsError as e:
+            return get_business_requirement_error_response(e, status.HTTP_404_NOT_FOUND)
+
+        return JsonResponse({"data": resp}, status=status.HTTP_200_OK)
+
+    if request.method == "DELETE":
+        return await delete_user(request, user, pk)
+
+    return await update_user(request, user, pk)
+
+
+user_detail.query_budget = 2
+
+
+async def delete_user(request: HttpRequest, user: ClaimsUser, pk: int) -> HttpResponse:
+    if not user.is_staff:
+        return JsonResponse(
+            {"detail": "You do not have permission to perform this action."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    # If the user tries to delete themselves raise an error.
+    if user.id == pk:
+        return get_business_requirement_error_response(
+            domain_errors.YouCannotDeleteYourselfError(),
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        await user_service.aremove_user(pk)
+    except domain_errors.UserDoesNotExistsError as e:
+        return get_business_requirement_error_response(e, status.HTTP_404_NOT_FOUND)
+
+    return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+
+async def update_user(request: HttpRequest, user: ClaimsUser, pk: int) -> HttpResponse:
+    if not user.is_superuser and user.id != pk:
+        return JsonResponse(
+            {"detail": "You do not have permission to perform this action."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    try:
+        request_data = load_json(request)
+    except ValueError as e:
+        return JsonResponse({"detail": f"JSON parse error - {e}"}, status=400)
+
+    unsafe_fields = {
+        key: request_data[key]
+        for key in ("username", "first_name", "last_name")
+        if key in request_data
+    }
+    safe_fields = await run_blocking(strip_xss_from_fields, unsafe_fields)
+
+    try:
+        version, _ = await user_service.aupdate_user_profile_by_id(
+            pk,
+            safe_username=safe_fields.get("username"),
+            safe_first_name=safe_fields.get("first_name"),
+            safe_last_name=safe_fields.get("last_name"),
+            expected_versions=get_if_match_versions(request),
+        )
+    except marshmallow.ValidationError as e:
+        return get_validation_error_response(e, status.HTTP_422_UNPROCESSABLE_ENTITY)
+    except domain_errors.UserDoesNotExistsError as e:
+        return get_business_requirement_error_response(e, status.HTTP_404_NOT_FOUND)
+    except domain_errors.UsernameAlreadyExistsError as e:
+        return get_business_requirement_error_response(e, status.HTTP_409_CONFLICT)
+    except domain_errors.ProfileVersionConflictError as e:
+        return get_business_requirement_error_response(
+            e, status.HTTP_412_PRECONDITION_FAILED
+        )
+
+    return HttpResponse(
+        status=status.HTTP_204_NO_CONTENT, headers={"ETag": get_etag(version)}
+    )
@@ -1,3 +1,5 @@
+import math
+
 import marshmallow
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -14,13 +16,46 @@ from utils.error_utils import (
 )
 from errors import domain_errors
 from community.services import user_service
+from utils.throttling_utils import get_client_ip, throttle
+
+
+def get_too_many_requests_response(e: domain_errors.TooManyRequestsError) -> Response:
+    response = get_business_requirement_error_messages(
+        e, status.HTTP_429_TOO_MANY_REQUESTS
+    )
+    response["Retry-After"] = str(math.ceil(e.retry_after))
+    return response
 
 
 class LogInView(TokenObtainPairView):
     serializer_class = TokenSerializer
+    # The user lookup, and saving the password when its hash is upgraded.
+    query_budget = 2
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        # Before any query or password check, so that bursts cost nothing.
+        try:
+            throttle(
+                "log_in",
+                ip=get_client_ip(request),
+                username=request.data.get("username"),
+            )
+        except domain_errors.TooManyRequestsError as e:
+            return get_too_many_requests_response(e)
+
+        try:
+            return super().post(request, *args, **kwargs)
+        except domain_errors.ServiceOverloadedError as e:
+            return get_business_requirement_error_messages(
+                e, status.HTTP_503_SERVICE_UNAVAILABLE
+            )
 
 
 class SignUpView(APIView):
+    # The user, its email address, the job that sends the verification email,
+    # and the one that removes the previous owner of a claimed address.
+    query_budget = 4
+
     def post(self, request: Request) -> Response:
         unsafe_first_name = request.data.get("first_name", "")
         unsafe_last_name = request.data.get("last_name", "")
@@ -29,6 +64,16 @@ class SignUpView(APIView):
         unsafe_terms_of_service = request.data.get("terms_of_service", None)
         unsafe_password = request.data.get("password", "")
 
+        try:
+            throttle(
+                "sign_up",
+                ip=get_client_ip(request),
+                username=unsafe_username,
+                email=unsafe_email,
+            )
+        except domain_errors.TooManyRequestsError as e:
+            return get_too_many_requests_response(e)
+
         safe_first_name = strip_xss(unsafe_first_name)
         safe_last_name = strip_xss(unsafe_last_name)
         safe_username = strip_xss(unsafe_username)
@@ -57,6 +102,10 @@ class SignUpView(APIView):
             return get_business_requirement_error_messages(
                 e, status.HTTP_429_TOO_MANY_REQUESTS
             )
+        except domain_errors.ServiceOverloadedError as e:
+            return get_business_requirement_error_messages(
+                e, status.HTTP_503_SERVICE_UNAVAILABLE
+            )
 
         resp = {"data": {"auth_token": auth_token, "user_id": user_model.id}}
         return Response(data=resp, status=status.HTTP_201_CREATED)
@@ -0,0 +1,127 @@
+import marshmallow
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSet
+
+from community.services import email_verification_service, user_service
+from errors import domain_errors
+from permissions import IsAdminOrOwner
+from utils import viewset_utils
+from utils.error_utils import (
+    get_business_requirement_error_messages,
+    get_validation_error_response,
+)
+from utils.sanitization_utils import strip_xss
+
+
+class EmailAddressViewSet(viewset_utils.ViewSetActionPermissionMixin, ViewSet):
+    """The email addresses of a user, under /api/users/<user_pk>/emails/."""
+
+    permission_action_classes = {
+        "list": [IsAuthenticated, IsAdminOrOwner],
+        "create": [IsAuthenticated, IsAdminOrOwner],
+        "verify": [IsAdminUser],
+        "promote": [IsAuthenticated, IsAdminOrOwner],
+        "destroy": [IsAuthenticated, IsAdminOrOwner],
+    }
+    # Queries per action, including the one that loads the authenticated user.
+    query_budgets = {
+        # One more for users without addresses, whose existence is checked.
+        "list": 3,
+        "create": 4,
+        "verify": 2,
+        "promote": 5,
+        "destroy": 3,
+    }
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        # Every action acts on the addresses of one user, so ownership is
+        # checked once, on the user id alone.
+        self.check_object_permissions(
+            request, get_user_model()(pk=int(kwargs["user_pk"]))
+        )
+
+    def list(self, request, user_pk):
+        try:
+            resp = user_service.get_email_addresses(int(user_pk))
+        except domain_errors.UserDoesNotExistsError as e:
+            return get_business_requirement_error_messages(e, status.HTTP_404_NOT_FOUND)
+
+        return Response(data={"data": resp}, status=status.HTTP_200_OK)
+
+    def create(self, request, user_pk):
+        safe_email = strip_xss(request.data.get("email", ""))
+
+        try:
+            resp = user_service.add_email_address(int(user_pk), safe_email)
+        except marshmallow.ValidationError as e:
+            return get_validation_error_response(
+                e, status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        except domain_errors.UserDoesNotExistsError as e:
+            return get_business_requirement_error_messages(e, status.HTTP_404_NOT_FOUND)
+        except domain_errors.EmailAddressAlreadyExistsError as e:
+            return get_business_requirement_error_messages(e, status.HTTP_409_CONFLICT)
+
+        return Response(data={"data": resp}, status=status.HTTP_201_CREATED)
+
+    def verify(self, request, user_pk, pk):
+        try:
+            user_service.verify_email_address(int(user_pk), int(pk))
+        except domain_errors.EmailAddressDoesNotExistError as e:
+            return get_business_requirement_error_messages(e, status.HTTP_404_NOT_FOUND)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def promote(self, request, user_pk, pk):
+        try:
+            user_service.set_primary_email_address(int(user_pk), int(pk))
+        except domain_errors.EmailAddressDoesNotExistError as e:
+            return get_business_requirement_error_messages(e, status.HTTP_404_NOT_FOUND)
+        except domain_errors.EmailAddressNotVerifiedError as e:
+            return get_business_requirement_error_messages(
+                e, status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def destroy(self, request, user_pk, pk):
+        try:
+            user_service.remove_email_address(int(user_pk), int(pk))
+        except domain_errors.EmailAddressDoesNotExistError as e:
+            return get_business_requirement_error_messages(e, status.HTTP_404_NOT_FOUND)
+        except domain_errors.CannotRemovePrimaryEmailAddressError as e:
+            return get_business_requirement_error_messages(
+                e, status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class EmailVerificationView(APIView):
+    """Verifies an address with the token sent to it, under /api/emails/verify/.
+
+    The token is the only credential, so no authentication is needed.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    # The token is checked by the update that verifies the address.
+    query_budget = 1
+
+    def post(self, request):
+        token = request.data.get("token", "")
+
+        try:
+            email_verification_service.verify(str(token))
+        except domain_errors.InvalidEmailVerificationTokenError as e:
+            return get_business_requirement_error_messages(
+                e, status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
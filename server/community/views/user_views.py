@@ -1,40 +1,118 @@
 import marshmallow
+from django.contrib.auth import get_user_model
 from rest_framework import status
-from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ViewSet
 
+from community.authentication import JWTTokenUserAuthentication
 from community.services import user_service
 from errors import domain_errors
 from errors.domain_errors import UserDoesNotExistsError
 from permissions import IsAdminOrOwner
+from utils.conditional_utils import (
+    get_etag,
+    get_if_match_versions,
+    get_not_modified_response,
+    has_if_none_match,
+    is_not_modified,
+)
 from utils.error_utils import (
     get_business_requirement_error_messages,
+    get_record_error,
     get_validation_error_response,
 )
+from utils.import_utils import (
+    CSVRecordParser,
+    JSONRecordParser,
+    NDJSONRecordParser,
+)
 from utils import viewset_utils
-from utils.sanitization_utils import strip_xss
+from utils.pagination_utils import KeysetPagination, RankedPagination
+from utils.sanitization_utils import strip_xss, strip_xss_from_fields
 
 
 class UserViewSet(viewset_utils.ViewSetActionPermissionMixin, ViewSet):
+    lookup_value_regex = r"\d+"
+    pagination_class = KeysetPagination
     permission_action_classes = {
+        "list": [IsAdminUser],
         "get": [IsAuthenticated],
         "delete": [IsAdminUser],
         "update": [IsAuthenticated, IsAdminOrOwner],
+        "partial_update": [IsAuthenticated, IsAdminOrOwner],
+        "search": [IsAuthenticated],
+    }
+    # Queries per action, including the one that loads the authenticated user.
+    query_budgets = {
+        "list": 2,
+        # One more when If-None-Match is stale and the profile is not cached.
+        "get": 3,
+        # Marking the user as deleted, and enqueuing the purge unless one is
+        # already waiting.
+        "delete": 3,
+        "update": 3,
+        "partial_update": 3,
+        "search": 2,
     }
 
+    def list(self, request):
+        try:
+            user_queryset = user_service.get_users(request.query_params)
+        except marshmallow.ValidationError as e:
+            return get_validation_error_response(
+                e, status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(user_queryset, request, view=self)
+        resp = [user_service.get_user_profile(user_model) for user_model in page]
+
+        return paginator.get_paginated_response(resp)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        try:
+            user_queryset = user_service.search_users(request.query_params)
+        except marshmallow.ValidationError as e:
+            return get_validation_error_response(
+                e, status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        paginator = RankedPagination()
+        page = paginator.paginate_queryset(user_queryset, request, view=self)
+        resp = [user_service.get_user_profile(user_model) for user_model in page]
+
+        return paginator.get_paginated_response(resp)
+
     def get(self, request, pk):
+        # "05" and "5" are the same user, and must share a cache entry.
+        pk = int(pk)
+
         try:
-            user_model = user_service.get(user_id=pk)
+            # A poll with the current ETag is answered from the version alone.
+            if has_if_none_match(request):
+                etag = get_etag(user_service.get_user_profile_version(pk))
+                if is_not_modified(request, etag):
+                    return get_not_modified_response(etag)
+
+            version, resp = user_service.get_versioned_user_profile_by_id(user_id=pk)
         except domain_errors.UserDoesNotExistsError as e:
             return get_business_requirement_error_messages(e, status.HTTP_404_NOT_FOUND)
 
-        resp = user_service.get_user_profile(user_model)
-
-        return Response(data={"data": resp}, status=status.HTTP_200_OK)
+        return Response(
+            data={"data": resp},
+            status=status.HTTP_200_OK,
+            headers={"ETag": get_etag(version)},
+        )
 
     def delete(self, request, pk):
+        pk = int(pk)
+
         # If the user tries to delete themselves raise an error.
         if request.user.id == pk:
             return get_business_requirement_error_messages(
@@ -50,21 +128,28 @@ class UserViewSet(viewset_utils.ViewSetActionPermissionMixin, ViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def update(self, request, pk=None):
-        try:
-            user_model = user_service.get(user_id=pk)
-
-            self.check_object_permissions(request, user_model)
+        # Only the fields present in the request are changed, so PUT and PATCH
+        # behave the same. Ownership is checked on the id alone, which saves
+        # loading the user before the update. With If-Match, the update only
+        # applies to the version the client has read.
+        user_id = int(pk)
+        self.check_object_permissions(request, get_user_model()(pk=user_id))
+
+        unsafe_fields = {
+            field: request.data[field]
+            for field in ("username", "first_name", "last_name")
+            if field in request.data
+        }
+        safe_fields = {
+            f"safe_{field}": value
+            for field, value in strip_xss_from_fields(unsafe_fields).items()
+        }
 
-            unsafe_username = request.data.get("username", user_model.username)
-            unsafe_first_name = request.data.get("first_name", user_model.first_name)
-            unsafe_last_name = request.data.get("last_name", user_model.last_name)
-
-            safe_username = strip_xss(unsafe_username)
-            safe_first_name = strip_xss(unsafe_first_name)
-            safe_last_name = strip_xss(unsafe_last_name)
-
-            user_service.update_user_profile_by_id(
-                pk, safe_username, safe_first_name, safe_last_name
+        try:
+            version, _ = user_service.update_user_profile_by_id(
+                user_id,
+                **safe_fields,
+                expected_versions=get_if_match_versions(request),
             )
         except marshmallow.ValidationError as e:
             return get_validation_error_response(
@@ -72,18 +157,90 @@ class UserViewSet(viewset_utils.ViewSetActionPermissionMixin, ViewSet):
             )
         except domain_errors.UserDoesNotExistsError as e:
             return get_business_requirement_error_messages(e, status.HTTP_404_NOT_FOUND)
+        except domain_errors.UsernameAlreadyExistsError as e:
+            return get_business_requirement_error_messages(e, status.HTTP_409_CONFLICT)
+        except domain_errors.ProfileVersionConflictError as e:
+            return get_business_requirement_error_messages(
+                e, status.HTTP_412_PRECONDITION_FAILED
+            )
         except domain_errors.CannotEditUserError as e:
             return get_business_requirement_error_messages(e, status.HTTP_403_FORBIDDEN)
 
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(
+            status=status.HTTP_204_NO_CONTENT, headers={"ETag": get_etag(version)}
+        )
+
+    def partial_update(self, request, pk=None):
+        return self.update(request, pk)
 
 
 class GetMeView(APIView):
+    # Only the user id is taken from the token. The profile is read through
+    # the profile cache, which every change invalidates, so that it is current
+    # rather than as of when the token was issued.
+    authentication_classes = [JWTTokenUserAuthentication, SessionAuthentication]
     permission_classes = [IsAuthenticated]
+    # As for another user's profile, plus the session and its user without a
+    # token.
+    query_budget = 4
+
+    def get(self, request):
+        user_id = request.user.id
+
+        try:
+            # A poll with the current ETag is answered from the version alone.
+            if has_if_none_match(request):
+                etag = get_etag(user_service.get_user_profile_version(user_id))
+                if is_not_modified(request, etag):
+                    return get_not_modified_response(etag)
+
+            version, resp = user_service.get_versioned_user_profile_by_id(user_id)
+        except domain_errors.UserDoesNotExistsError as e:
+            return get_business_requirement_error_messages(e, status.HTTP_404_NOT_FOUND)
+
+        return Response(
+            data={"data": resp},
+            status=status.HTTP_200_OK,
+            headers={"ETag": get_etag(version)},
+        )
+
+
+class UsernameAvailabilityView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    # Only usernames that may be taken are checked against the database.
+    query_budget = 1
 
     def get(self, request):
-        user_model = request.user
+        safe_username = strip_xss(request.query_params.get("username", ""))
+
+        try:
+            available = user_service.is_username_available(safe_username)
+        except marshmallow.ValidationError as e:
+            return get_validation_error_response(
+                e, status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        resp = {"username": safe_username, "available": available}
+
+        return Response(data={"data": resp}, status=status.HTTP_200_OK)
+
+
+class BulkUserCreationView(APIView):
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONRecordParser, CSVRecordParser, NDJSONRecordParser]
+
+    def post(self, request):
+        unsafe_records = request.data
+
+        if not isinstance(unsafe_records, list):
+            raise ParseError("Expected a list of users.")
+
+        result = user_service.bulk_create_users(unsafe_records)
 
-        resp = user_service.get_user_profile(user_model)
+        resp = {
+            "created_count": result["created_count"],
+            "errors": [get_record_error(index, e) for index, e in result["errors"]],
+        }
 
         return Response(data={"data": resp}, status=status.HTTP_200_OK)
@@ -25,16 +25,35 @@ class EmailAddressAlreadyExistsError(Error):
     internal_code = 40902
 
 
+class ProfileVersionConflictError(Error):
+    message = "The profile was changed since it was read, fetch it and try again."
+    internal_code = 41201
+
+
 class TermsNotAcceptedError(Error):
     message = "You must accept the terms of service."
     internal_code = 42901
 
 
+class TooManyRequestsError(Error):
+    message = "Too many requests, please try again later."
+    internal_code = 42902
+
+    def __init__(self, value="", retry_after: float = 0.0):
+        super().__init__(value)
+        self.retry_after = retry_after
+
+
 class UserDoesNotExistsError(Error):
     message = "User does not exists."
     internal_code = 40401
 
 
+class EmailAddressDoesNotExistError(Error):
+    message = "Email address does not exist."
+    internal_code = 40402
+
+
 class CannotEditUserError(Error):
     message = "You can not edit the user due to insufficient privileges"
     internal_code = 40301
@@ -43,3 +62,23 @@ class CannotEditUserError(Error):
 class YouCannotDeleteYourselfError(Error):
     message = "You can not delete yourself."
     internal_code = 40001
+
+
+class CannotRemovePrimaryEmailAddressError(Error):
+    message = "You can not remove your primary email address."
+    internal_code = 40002
+
+
+class EmailAddressNotVerifiedError(Error):
+    message = "Only a verified email address can become the primary one."
+    internal_code = 40003
+
+
+class InvalidEmailVerificationTokenError(Error):
+    message = "The verification link is invalid or has expired."
+    internal_code = 40004
+
+
+class ServiceOverloadedError(Error):
+    message = "The service is overloaded, please try again later."
+    internal_code = 50301
@@ -1,3 +1,4 @@
+from django.contrib.auth import get_user_model
 from django.db import models
 
 from rest_framework.request import Request
@@ -14,11 +15,13 @@ class IsAdminOrOwner(BasePermission):
         if request.user.is_superuser:
             return True
 
-        if hasattr(obj, "user_model"):
-            if obj.user_model == request.user:
+        # Compare primary keys, since `request.user` may be a `ClaimsUser` built
+        # from the token rather than a model instance.
+        if hasattr(obj, "user_model_id"):
+            if obj.user_model_id == request.user.pk:
                 return True
 
-        if obj == request.user:
+        if isinstance(obj, get_user_model()) and obj.pk == request.user.pk:
             return True
 
         return False
@@ -46,6 +46,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "utils.metrics_utils.MetricsMiddleware",
+    "utils.query_budget_utils.QueryBudgetMiddleware",
+    "utils.timing_utils.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -91,6 +94,163 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+# The local-memory backend is per process, so profile invalidations only reach
+# the worker that made the change. Point "profiles" to a shared backend such as
+# Redis or Memcached when running several workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "profiles": {
+        "BACKEND": os.getenv(
+            "PROFILE_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("PROFILE_CACHE_LOCATION", "profiles"),
+        "TIMEOUT": int(os.getenv("PROFILE_CACHE_TIMEOUT", "300")),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "10000")),
+        },
+    },
+}
+
+
+# Async views
+
+# Size of the pool that runs blocking work such as sanitization off the event
+# loop when served through ASGI.
+BLOCKING_EXECUTOR_MAX_WORKERS = int(
+    os.getenv("BLOCKING_EXECUTOR_MAX_WORKERS", str(os.cpu_count() or 1))
+)
+
+
+# Query budgets
+
+# Share of requests whose queries are counted against the budgets declared on
+# the views, and how often one query may repeat before it is reported as N+1.
+QUERY_BUDGET_SAMPLE_RATE = float(os.getenv("QUERY_BUDGET_SAMPLE_RATE", "0.01"))
+QUERY_BUDGET_REPEATED_QUERY_THRESHOLD = int(
+    os.getenv("QUERY_BUDGET_REPEATED_QUERY_THRESHOLD", "5")
+)
+
+
+# Server-Timing
+
+# Adds the time spent per phase (sanitization, validation, hashing, ...) to
+# every response in a Server-Timing header, and logs it.
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+
+# Throttling
+
+# Token buckets per process for the endpoints that hash passwords, by scope and
+# kind of key. Rates are "<requests>/<s|min|hour|day>".
+THROTTLE_RATES = {
+    "log_in": {
+        "ip": os.getenv("LOG_IN_IP_THROTTLE_RATE", "30/min"),
+        "username": os.getenv("LOG_IN_USERNAME_THROTTLE_RATE", "10/min"),
+    },
+    "sign_up": {
+        "ip": os.getenv("SIGN_UP_IP_THROTTLE_RATE", "20/min"),
+        "username": os.getenv("SIGN_UP_USERNAME_THROTTLE_RATE", "5/min"),
+        "email": os.getenv("SIGN_UP_EMAIL_THROTTLE_RATE", "5/min"),
+    },
+}
+
+
+# Background jobs
+
+# Worker threads per `manage.py run_workers` process, how often idle workers
+# look for due jobs, and how failing jobs are retried: exponential backoff from
+# the base delay up to the maximum one, for at most MAX_ATTEMPTS runs.
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+
+# Deleted users are purged by jobs of this many users each, run this many seconds
+# apart.
+USER_PURGE_BATCH_SIZE = int(os.getenv("USER_PURGE_BATCH_SIZE", "500"))
+USER_PURGE_PAUSE_SECONDS = float(os.getenv("USER_PURGE_PAUSE_SECONDS", "0.1"))
+
+
+# Email verification
+
+# Verification emails link to EMAIL_VERIFICATION_URL, with the token in place of
+# "{token}": a page of the client that posts the token to /api/emails/verify/.
+# Tokens are accepted for EMAIL_VERIFICATION_MAX_AGE_SECONDS.
+EMAIL_BACKEND = os.getenv(
+    "EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend"
+)
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "no-reply@localhost")
+EMAIL_VERIFICATION_URL = os.getenv(
+    "EMAIL_VERIFICATION_URL", "http://localhost:3000/verify-email?token={token}"
+)
+EMAIL_VERIFICATION_MAX_AGE_SECONDS = int(
+    os.getenv("EMAIL_VERIFICATION_MAX_AGE_SECONDS", str(7 * 24 * 3600))
+)
+
+
+# Metrics
+
+# Addresses allowed to scrape /metrics/. Set PROMETHEUS_MULTIPROC_DIR when
+# running several worker processes.
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+
+
+# Username availability
+
+# Taken usernames are kept in a Bloom filter per process. New users from other
+# processes are picked up every REFRESH seconds, and the filter is rebuilt every
+# REBUILD seconds or once MAX_STALE_RATIO of its capacity was renamed or deleted.
+USERNAME_FILTER_MIN_CAPACITY = int(os.getenv("USERNAME_FILTER_MIN_CAPACITY", "100000"))
+USERNAME_FILTER_ERROR_RATE = float(os.getenv("USERNAME_FILTER_ERROR_RATE", "0.01"))
+USERNAME_FILTER_REFRESH_SECONDS = int(os.getenv("USERNAME_FILTER_REFRESH_SECONDS", "5"))
+USERNAME_FILTER_REBUILD_SECONDS = int(
+    os.getenv("USERNAME_FILTER_REBUILD_SECONDS", "3600")
+)
+USERNAME_FILTER_MAX_STALE_RATIO = float(
+    os.getenv("USERNAME_FILTER_MAX_STALE_RATIO", "0.1")
+)
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.0/topics/auth/passwords/
+
+PASSWORD_HASHERS = [
+    "community.hashers.CalibratedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Pick it with `manage.py calibrate_password_hasher` on the deployment hardware.
+PASSWORD_HASHER_ITERATIONS = int(os.getenv("PASSWORD_HASHER_ITERATIONS", "320000"))
+
+# Hashing runs in a "thread" or "process" pool. Requests that would queue
+# beyond the depth limit are rejected with a 503. Batch hashing, such as user
+# imports, runs on at most BULK_MAX_WORKERS of the workers and waits instead.
+PASSWORD_HASHING_POOL = os.getenv("PASSWORD_HASHING_POOL", "thread")
+PASSWORD_HASHING_MAX_WORKERS = int(
+    os.getenv("PASSWORD_HASHING_MAX_WORKERS", str(os.cpu_count() or 1))
+)
+PASSWORD_HASHING_MAX_QUEUE_DEPTH = int(
+    os.getenv("PASSWORD_HASHING_MAX_QUEUE_DEPTH", "64")
+)
+PASSWORD_HASHING_BULK_MAX_WORKERS = int(
+    os.getenv(
+        "PASSWORD_HASHING_BULK_MAX_WORKERS",
+        str(max(1, PASSWORD_HASHING_MAX_WORKERS // 2)),
+    )
+)
+
+AUTHENTICATION_BACKENDS = ["community.backends.PooledHashingModelBackend"]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -138,7 +298,7 @@ AUTH_USER_MODEL = "community.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "community.authentication.JWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     )
 }
@@ -147,6 +307,7 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": datetime.timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": datetime.timedelta(days=1),
     "USER_ID_CLAIM": "id",
+    "TOKEN_USER_CLASS": "community.authentication.ClaimsUser",
 }
 
 
@@ -16,7 +16,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from utils.metrics_utils import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("community.urls")),
+    path("metrics/", metrics_view, name="metrics"),
 ]
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sports.settings')
 
 application = get_wsgi_application()
+
+# Once the apps are loaded: build the filter of taken usernames before the
+# first sign-up needs it, and keep it up to date.
+from community.services import username_availability_service
+
+username_availability_service.start()
@@ -0,0 +1,43 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from django.conf import settings
+
+T = TypeVar("T")
+
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Return the bounded pool used for CPU-bound work such as password hashing
+    and sanitization, so it never runs on the event loop."""
+
+    global _blocking_executor
+
+    if _blocking_executor is None:
+        _blocking_executor = ThreadPoolExecutor(
+            max_workers=settings.BLOCKING_EXECUTOR_MAX_WORKERS,
+            thread_name_prefix="blocking",
+        )
+
+    return _blocking_executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_blocking_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+def async_csrf_exempt(view_func):
+    """Mark an async view as exempt from CSRF checks.
+
+    `django.views.decorators.csrf.csrf_exempt` wraps the view in a sync
+    function, which would make Django run an async view in a thread.
+    """
+
+    view_func.csrf_exempt = True
+    return view_func
@@ -0,0 +1,137 @@
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable, TypedDict
+
+from django.db import connection
+
+
+class BenchmarkResult(TypedDict):
+    scenario: str
+    dataset_size: int
+    requests: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    requests_per_second: float
+    queries_per_request: float
+    peak_memory_kib: float
+
+
+class QueryCounter:
+    """Database execute wrapper that counts the queries it sees."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(
+    scenario: str,
+    dataset_size: int,
+    prepare: Callable[[int], Callable[[], Any]],
+    requests: int,
+    warmup: int,
+    memory_requests: int,
+) -> BenchmarkResult:
+    """Run requests sequentially and summarize their latency, throughput,
+    queries and memory.
+
+    `prepare(i)` builds request `i` and returns a callable that sends it; only
+    the callable is timed. `i` is unique across one measurement, so scenarios
+    can use it to pick fresh data. Memory is measured in a separate pass
+    because tracemalloc slows every allocation down.
+    """
+
+    for i in range(warmup):
+        prepare(i)()
+
+    counter = QueryCounter()
+    latencies = []
+
+    with connection.execute_wrapper(counter):
+        for i in range(warmup, warmup + requests):
+            send = prepare(i)
+            start = time.perf_counter()
+            send()
+            latencies.append(time.perf_counter() - start)
+
+    peak_memory = 0
+    if memory_requests:
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            for i in range(warmup + requests, warmup + requests + memory_requests):
+                prepare(i)()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_memory = peak - baseline
+        finally:
+            tracemalloc.stop()
+
+    percentiles = get_percentiles(latencies)
+
+    return {
+        "scenario": scenario,
+        "dataset_size": dataset_size,
+        "requests": requests,
+        "p50_ms": round(percentiles[50] * 1000, 3),
+        "p95_ms": round(percentiles[95] * 1000, 3),
+        "p99_ms": round(percentiles[99] * 1000, 3),
+        "requests_per_second": round(requests / sum(latencies), 1),
+        "queries_per_request": round(counter.count / requests, 2),
+        "peak_memory_kib": round(peak_memory / 1024, 1),
+    }
+
+
+def get_percentiles(samples: list[float]) -> dict[int, float]:
+    """Return the 1st to 99th percentiles of `samples`, keyed by percentile."""
+
+    if len(samples) == 1:
+        return {percentile: samples[0] for percentile in range(1, 100)}
+
+    cut_points = statistics.quantiles(samples, n=100, method="inclusive")
+    return {percentile: cut_points[percentile - 1] for percentile in range(1, 100)}
+
+
+def compare_results(
+    results: Iterable[BenchmarkResult],
+    baseline: Iterable[BenchmarkResult],
+    max_regression: float,
+) -> list[str]:
+    """Return a description of every result that regressed against the baseline.
+
+    A result regressed when its p95 latency grew by more than `max_regression`
+    (a fraction) or when it runs more queries per request. Results without a
+    baseline are skipped.
+    """
+
+    baseline_by_key = {
+        (result["scenario"], result["dataset_size"]): result for result in baseline
+    }
+    regressions = []
+
+    for result in results:
+        key = (result["scenario"], result["dataset_size"])
+        if key not in baseline_by_key:
+            continue
+
+        previous = baseline_by_key[key]
+        name = f"{result['scenario']} ({result['dataset_size']} users)"
+
+        if result["p95_ms"] > previous["p95_ms"] * (1 + max_regression):
+            regressions.append(
+                f"{name}: p95 went from {previous['p95_ms']}ms to "
+                f"{result['p95_ms']}ms."
+            )
+
+        if result["queries_per_request"] > previous["queries_per_request"]:
+            regressions.append(
+                f"{name}: queries per request went from "
+                f"{previous['queries_per_request']} to "
+                f"{result['queries_per_request']}."
+            )
+
+    return regressions
@@ -0,0 +1,52 @@
+"""Conditional requests on versioned resources.
+
+A resource's ETag is its version, so whether a client's copy is current can be
+told from the version alone, before the resource is loaded or serialized.
+"""
+from typing import Optional
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+def get_etag(version: int) -> str:
+    return quote_etag(str(version))
+
+
+def has_if_none_match(request: Request) -> bool:
+    return "HTTP_IF_NONE_MATCH" in request.META
+
+
+def is_not_modified(request: Request, etag: Optional[str]) -> bool:
+    """Whether the request's If-None-Match matches `etag`, comparing weakly as
+    RFC 7232 requires for GET."""
+
+    if etag is None or not has_if_none_match(request):
+        return False
+
+    etags = parse_etags(request.META["HTTP_IF_NONE_MATCH"])
+
+    return "*" in etags or etag in (e.removeprefix("W/") for e in etags)
+
+
+def get_if_match_versions(request: Request) -> Optional[list[int]]:
+    """The versions listed in If-Match, or `None` when any version will do.
+
+    If-Match compares strongly, so weak ETags never match.
+    """
+
+    if_match = request.META.get("HTTP_IF_MATCH")
+    if if_match is None:
+        return None
+
+    etags = parse_etags(if_match)
+    if "*" in etags:
+        return None
+
+    return [int(etag[1:-1]) for etag in etags if etag[1:-1].isdigit()]
+
+
+def get_not_modified_response(etag: str) -> Response:
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,81 @@
+import functools
+
+from django.db import connection, models
+
+
+@functools.lru_cache(maxsize=None)
+def get_cascade_delete_sql(model: type[models.Model]) -> str:
+    """Return one statement that deletes rows of `model` by primary key together
+    with the rows that reference them.
+
+    The statement takes a single parameter, the list of primary keys, and
+    returns the primary keys that were deleted. Dependent rows are removed (or
+    nulled for `SET_NULL`) in data-modifying CTEs, so the whole cascade is a
+    single round trip; Postgres checks foreign keys once the statement is done.
+    Unlike `QuerySet.delete()` no `pre_delete`/`post_delete` signals are sent.
+
+    Only one level of dependents is supported. A dependent that has dependents
+    of its own, or an `on_delete` other than `CASCADE`, `SET_NULL` and
+    `DO_NOTHING`, raises `ValueError` so the statement never leaves orphans.
+    """
+
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    pk_column = qn(model._meta.pk.column)
+    dependent_statements = []
+
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        dependent_statements.append(
+            f"DELETE FROM {qn(through._meta.db_table)} "
+            f"WHERE {qn(field.m2m_column_name())} IN (SELECT id FROM doomed)"
+        )
+
+    for relation in model._meta.related_objects:
+        related_model = relation.related_model
+
+        if relation.many_to_many:
+            through = relation.field.remote_field.through
+            dependent_statements.append(
+                f"DELETE FROM {qn(through._meta.db_table)} "
+                f"WHERE {qn(relation.field.m2m_reverse_name())} "
+                f"IN (SELECT id FROM doomed)"
+            )
+            continue
+
+        column = qn(relation.field.column)
+        related_table = qn(related_model._meta.db_table)
+
+        if relation.on_delete is models.CASCADE:
+            if related_model._meta.related_objects:
+                raise ValueError(
+                    f"{related_model.__name__} has dependents of its own and "
+                    f"can not be deleted in a single statement."
+                )
+            dependent_statements.append(
+                f"DELETE FROM {related_table} WHERE {column} IN (SELECT id FROM doomed)"
+            )
+        elif relation.on_delete is models.SET_NULL:
+            dependent_statements.append(
+                f"UPDATE {related_table} SET {column} = NULL "
+                f"WHERE {column} IN (SELECT id FROM doomed)"
+            )
+        elif relation.on_delete is not models.DO_NOTHING:
+            raise ValueError(
+                f"{related_model.__name__}.{relation.field.name} uses an on_delete "
+                f"that can not be expressed in a single statement."
+            )
+
+    ctes = [
+        f"doomed AS (SELECT {pk_column} AS id FROM {table} WHERE {pk_column} = ANY(%s))"
+    ]
+    ctes += [
+        f"dependent_{i} AS ({statement})"
+        for i, statement in enumerate(dependent_statements)
+    ]
+
+    return (
+        f"WITH {', '.join(ctes)} "
+        f"DELETE FROM {table} WHERE {pk_column} IN (SELECT id FROM doomed) "
+        f"RETURNING {pk_column}"
+    )
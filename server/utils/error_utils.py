@@ -1,7 +1,37 @@
+from typing import Any, Union
+
 from rest_framework.response import Response
 import marshmallow
 
 from errors.domain_errors import IBusinessError
+from utils.metrics_utils import DOMAIN_ERRORS
+
+
+def get_validation_errors(
+    validation_error: marshmallow.ValidationError, display_error=""
+) -> dict[str, Any]:
+    return {
+        "display_error": display_error,
+        "field_errors": validation_error.normalized_messages(),
+    }
+
+
+def get_business_requirement_errors(
+    business_logic_error: IBusinessError,
+) -> dict[str, Any]:
+    return {
+        "display_error": business_logic_error.message,
+        "internal_error_code": business_logic_error.internal_code,
+    }
+
+
+def count_domain_error_response(business_logic_error: IBusinessError) -> None:
+    """Count an error response in `DOMAIN_ERRORS`, once per response, however
+    the error is formatted."""
+
+    DOMAIN_ERRORS.labels(
+        business_logic_error.internal_code, type(business_logic_error).__name__
+    ).inc()
 
 
 def get_validation_error_response(
@@ -9,12 +39,7 @@ def get_validation_error_response(
     http_status_code: int,
     display_error="",
 ) -> Response:
-    resp = {
-        "errors": {
-            "display_error": display_error,
-            "field_errors": validation_error.normalized_messages(),
-        }
-    }
+    resp = {"errors": get_validation_errors(validation_error, display_error)}
 
     return Response(data=resp, status=http_status_code)
 
@@ -22,11 +47,20 @@ def get_validation_error_response(
 def get_business_requirement_error_messages(
     business_logic_error: IBusinessError, http_status_code: int
 ) -> Response:
-    resp = {
-        "errors": {
-            "display_error": business_logic_error.message,
-            "internal_error_code": business_logic_error.internal_code,
-        }
-    }
+    count_domain_error_response(business_logic_error)
+    resp = {"errors": get_business_requirement_errors(business_logic_error)}
 
     return Response(data=resp, status=http_status_code)
+
+
+def get_record_error(
+    index: int, error: Union[marshmallow.ValidationError, IBusinessError]
+) -> dict[str, Any]:
+    """Return the error of a single record of a bulk request."""
+
+    if isinstance(error, marshmallow.ValidationError):
+        errors = get_validation_errors(error)
+    else:
+        errors = get_business_requirement_errors(error)
+
+    return {"index": index, "errors": errors}
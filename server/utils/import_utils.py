@@ -0,0 +1,74 @@
+import codecs
+import csv
+import json
+from typing import IO, Any, Iterator
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+RECORD_FORMATS = ("json", "csv", "ndjson")
+
+
+class RecordParseError(Exception):
+    """The records could not be read, because the input is malformed."""
+
+
+def read_records(stream: IO[str], record_format: str) -> Iterator[Any]:
+    """Yield the records of a JSON array, a CSV file or an NDJSON stream.
+
+    CSV and NDJSON are read lazily, line by line, so arbitrarily large
+    files can be streamed through without loading them in memory. Malformed
+    input raises `RecordParseError` once it is reached, which tells it apart
+    from the errors of whatever consumes the records.
+    """
+
+    try:
+        yield from _read_records(stream, record_format)
+    except (ValueError, csv.Error) as e:
+        raise RecordParseError(str(e)) from e
+
+
+def _read_records(stream: IO[str], record_format: str) -> Iterator[Any]:
+    if record_format == "json":
+        records = json.load(stream)
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON array of records.")
+        yield from records
+    elif record_format == "csv":
+        yield from csv.DictReader(stream)
+    elif record_format == "ndjson":
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported record format: {record_format}.")
+
+
+class RecordParser(BaseParser):
+    record_format = ""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            decoded_stream = codecs.getreader(encoding)(stream)
+            return list(read_records(decoded_stream, self.record_format))
+        except RecordParseError as exc:
+            raise ParseError(f"{self.record_format.upper()} parse error - {exc}")
+
+
+class JSONRecordParser(RecordParser):
+    media_type = "application/json"
+    record_format = "json"
+
+
+class CSVRecordParser(RecordParser):
+    media_type = "text/csv"
+    record_format = "csv"
+
+
+class NDJSONRecordParser(RecordParser):
+    media_type = "application/x-ndjson"
+    record_format = "ndjson"
@@ -0,0 +1,124 @@
+"""Prometheus metrics for the API.
+
+Metrics live in the default `prometheus_client` registry of each process and
+are exported as Prometheus text by `metrics_view`. When the server runs several
+worker processes, set `PROMETHEUS_MULTIPROC_DIR` to an empty directory shared by
+the workers: each of them then writes its samples there and `metrics_view`
+aggregates all of them, whichever worker serves the scrape.
+"""
+import os
+import time
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from utils.query_observer_utils import observe_queries
+
+REQUEST_DURATION = Histogram(
+    "sports_http_request_duration_seconds",
+    "Time spent serving a request, by URL name.",
+    ["view_name", "method", "status"],
+)
+REQUEST_DB_DURATION = Histogram(
+    "sports_http_request_db_duration_seconds",
+    "Time spent in the database while serving a request, by URL name.",
+    ["view_name", "method"],
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "sports_password_hash_duration_seconds",
+    "Time spent hashing or verifying a password, including waiting for the pool.",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+DOMAIN_ERRORS = Counter(
+    "sports_domain_errors_total",
+    "Domain errors returned to clients, by internal error code.",
+    ["internal_code", "error"],
+)
+
+
+class DatabaseTimer:
+    """Query observer that adds up the time spent in queries."""
+
+    def __init__(self) -> None:
+        self.duration = 0.0
+
+    def __call__(self, sql: str, duration: float) -> None:
+        self.duration += duration
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        database_timer = DatabaseTimer()
+        start = time.perf_counter()
+
+        with observe_queries(database_timer):
+            response = self.get_response(request)
+
+        self.observe(request, response, database_timer, start)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        database_timer = DatabaseTimer()
+        start = time.perf_counter()
+
+        with observe_queries(database_timer):
+            response = await self.get_response(request)
+
+        self.observe(request, response, database_timer, start)
+        return response
+
+    def observe(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        database_timer: DatabaseTimer,
+        start: float,
+    ) -> None:
+        # The URL name, rather than the path, keeps the number of series bounded.
+        resolver_match = getattr(request, "resolver_match", None)
+        view_name = resolver_match.view_name if resolver_match else "unresolved"
+
+        REQUEST_DURATION.labels(
+            view_name, request.method, response.status_code
+        ).observe(time.perf_counter() - start)
+        REQUEST_DB_DURATION.labels(view_name, request.method).observe(
+            database_timer.duration
+        )
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Export the metrics as Prometheus text, to `METRICS_ALLOWED_IPS` only."""
+
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        raise Http404()
+
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,68 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination on the primary key.
+
+    Every page is fetched with ``WHERE id > <cursor> ORDER BY id LIMIT n`` on
+    the primary key index, so deep pages cost the same as the first one.
+    """
+
+    ordering = "id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_paginated_response(self, data):
+        return Response(
+            data={
+                "data": data,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+            }
+        )
+
+
+class RankedPagination(LimitOffsetPagination):
+    """Limit/offset pagination for results ordered by a computed rank, which
+    can not be paged by key.
+
+    The matches are never counted: one row past the page tells whether there is
+    a next one. Offsets are capped, since ranked results are meant to be found
+    in the first few pages.
+    """
+
+    default_limit = 20
+    max_limit = 100
+    max_offset = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.offset = min(self.get_offset(request), self.max_offset)
+
+        rows = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+
+        return rows[: self.limit]
+
+    def get_next_link(self):
+        if not self.has_next or self.offset + self.limit > self.max_offset:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            data={
+                "data": data,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+            }
+        )
@@ -0,0 +1,148 @@
+"""Production guard against views that run more queries than they should.
+
+Views declare how many queries they may run, with `query_budget` on a view
+class or function, or `query_budgets` keyed by action on a viewset, next to
+`permission_action_classes`. `QueryBudgetMiddleware` counts the queries and
+DB time of a sample of requests and, when a view goes over its budget or
+repeats the same query, logs a warning and sends `query_budget_exceeded`.
+
+The middleware runs in the mode of the handler, so that ASGI requests are not
+moved to a thread on its account.
+"""
+import logging
+import random
+import re
+from collections import Counter
+from typing import Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.dispatch import Signal
+from django.http import HttpRequest, HttpResponse
+
+from utils.query_observer_utils import observe_queries
+
+logger = logging.getLogger(__name__)
+
+# Sent with the request, view_name, query_count, query_budget, db_time_ms and
+# repeated_queries, a list of (fingerprint, count) pairs.
+query_budget_exceeded = Signal()
+
+_IN_LIST = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def get_fingerprint(sql: str) -> str:
+    """Return `sql` with `IN` lists of any length collapsed, so that queries
+    which only differ in their parameters share a fingerprint."""
+
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(...)", sql)).strip()
+
+
+class QueryRecorder:
+    """Query observer that counts queries, their fingerprints and the time
+    spent running them."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter[str] = Counter()
+
+    def __call__(self, sql: str, duration: float) -> None:
+        self.duration += duration
+        self.count += 1
+        self.fingerprints[get_fingerprint(sql)] += 1
+
+
+def get_query_budget(view_func: Callable, method: str) -> Optional[int]:
+    """Return the query budget the view declares for `method`, if any."""
+
+    view_class = getattr(view_func, "cls", None)
+    actions = getattr(view_func, "actions", None)
+
+    if view_class is not None and actions:
+        # Like `ViewSet.dispatch`, fall back to the handler named after the
+        # method when the router mapped no action to it.
+        action = actions.get(method.lower(), method.lower())
+        return getattr(view_class, "query_budgets", {}).get(action)
+
+    return getattr(view_class or view_func, "query_budget", None)
+
+
+class QueryBudgetMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if random.random() >= settings.QUERY_BUDGET_SAMPLE_RATE:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with observe_queries(recorder):
+            response = self.get_response(request)
+
+        self.check(request, recorder)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if random.random() >= settings.QUERY_BUDGET_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        with observe_queries(recorder):
+            response = await self.get_response(request)
+
+        self.check(request, recorder)
+        return response
+
+    def check(self, request: HttpRequest, recorder: QueryRecorder) -> None:
+        # Read from the resolved view afterwards, as a `process_view` hook
+        # would be run in a thread under ASGI.
+        resolver_match = getattr(request, "resolver_match", None)
+        query_budget = (
+            get_query_budget(resolver_match.func, request.method)
+            if resolver_match
+            else None
+        )
+        repeated_queries = [
+            (fingerprint, count)
+            for fingerprint, count in recorder.fingerprints.most_common()
+            if count >= settings.QUERY_BUDGET_REPEATED_QUERY_THRESHOLD
+        ]
+        over_budget = query_budget is not None and recorder.count > query_budget
+
+        if not over_budget and not repeated_queries:
+            return
+
+        view_name = resolver_match.view_name if resolver_match else request.path
+        event = {
+            "view_name": view_name,
+            "method": request.method,
+            "query_count": recorder.count,
+            "query_budget": query_budget,
+            "db_time_ms": round(recorder.duration * 1000, 3),
+            "repeated_queries": repeated_queries,
+        }
+
+        logger.warning(
+            "%s %s ran %d queries (budget: %s) in %.1fms; repeated queries: %s",
+            request.method,
+            view_name,
+            recorder.count,
+            query_budget,
+            recorder.duration * 1000,
+            [
+                f"{count}x {fingerprint[:200]}"
+                for fingerprint, count in repeated_queries
+            ],
+            extra=event,
+        )
+        query_budget_exceeded.send(sender=self.__class__, request=request, **event)
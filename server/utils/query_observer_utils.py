@@ -0,0 +1,54 @@
+"""Report the queries of the current request to the middleware that measure it.
+
+An execute wrapper installed by a middleware only sees the connections of the
+thread that installs it, while async views run their queries on another one,
+through `sync_to_async`. Instead, every connection gets `execute_wrapper` once,
+when it connects, and reports each query to the observers of the current
+context: context variables follow the request into `sync_to_async` threads.
+
+Without an observer a query costs one context variable lookup.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+# Called with the SQL and the duration of each query, in seconds.
+QueryObserver = Callable[[str, float], None]
+
+_observers: contextvars.ContextVar[tuple[QueryObserver, ...]] = contextvars.ContextVar(
+    "query_observers", default=()
+)
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    observers = _observers.get()
+    if not observers:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        for observer in observers:
+            observer(sql, duration)
+
+
+def install_execute_wrapper(sender, connection, **kwargs) -> None:
+    """`connection_created` receiver, connected in `CommunityConfig.ready`."""
+
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+@contextmanager
+def observe_queries(observer: QueryObserver) -> Iterator[None]:
+    """Report the queries run in the block, and in the `sync_to_async` calls
+    it awaits, to `observer`."""
+
+    token = _observers.set(_observers.get() + (observer,))
+    try:
+        yield
+    finally:
+        _observers.reset(token)
@@ -0,0 +1,110 @@
+"""Token-bucket throttling kept in the memory of each process.
+
+Rates are read from `THROTTLE_RATES`, per scope and per kind of key, e.g.
+``{"log_in": {"ip": "30/min", "username": "10/min"}}``; a scope or kind without
+a rate is not throttled. A rejected request costs a dictionary lookup under a
+lock and no queries, so bursts are turned away before any password is hashed.
+
+Every worker process keeps its own buckets, so the effective rate is the
+configured one times the number of workers.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpRequest
+from rest_framework.throttling import BaseThrottle
+
+from errors import domain_errors
+
+PERIODS = {"s": 1, "sec": 1, "min": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """Return the requests and the seconds of a rate such as "10/min"."""
+
+    count, period = rate.split("/")
+    return int(count), PERIODS[period]
+
+
+class TokenBucketLimiter:
+    """One token bucket per key, holding up to `count` tokens and refilled at
+    `count` per `period`.
+
+    Only the `max_keys` most recently used buckets are kept; the ones dropped
+    start full again, as do idle buckets after one period.
+    """
+
+    def __init__(self, rate: str, max_keys: int = 100_000) -> None:
+        count, period = parse_rate(rate)
+        self.capacity = count
+        self.refill_rate = count / period
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str) -> float:
+        """Take a token for `key`, returning 0 on success or else the seconds
+        until a token is available."""
+
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.refill_rate
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+
+_limiters: dict[tuple[str, str, str], TokenBucketLimiter] = {}
+
+
+def get_limiter(scope: str, kind: str, rate: str) -> TokenBucketLimiter:
+    key = (scope, kind, rate)
+    if key not in _limiters:
+        _limiters.setdefault(key, TokenBucketLimiter(rate))
+
+    return _limiters[key]
+
+
+def get_client_ip(request: HttpRequest) -> str:
+    # Honours REST_FRAMEWORK["NUM_PROXIES"] like the DRF throttles.
+    return BaseThrottle().get_ident(request)
+
+
+def throttle(scope: str, **keys: Optional[str]) -> None:
+    """Take a token from the bucket of each key, raising `TooManyRequestsError`
+    when any of them is empty.
+
+    Keys are given by kind, e.g. ``throttle("log_in", ip=..., username=...)``;
+    they are compared case-insensitively and missing ones are skipped.
+    """
+
+    rates = settings.THROTTLE_RATES.get(scope, {})
+    wait = 0.0
+
+    for kind, key in keys.items():
+        if isinstance(key, str) and key and kind in rates:
+            limiter = get_limiter(scope, kind, rates[kind])
+            wait = max(wait, limiter.consume(key.lower()))
+
+    if wait:
+        raise domain_errors.TooManyRequestsError(retry_after=wait)
+
+
+def reset_throttles() -> None:
+    """Drop every bucket."""
+
+    _limiters.clear()
@@ -0,0 +1,178 @@
+"""Per-request breakdown of where the time goes.
+
+Hot paths mark their phases with `timed`, as a decorator or a context manager:
+
+    @timed("hash")
+    def make_password(...): ...
+
+    with timed("validate"):
+        ...
+
+`ServerTimingMiddleware` adds up the time of each phase for the request and
+returns it in the `Server-Timing` header, next to the time spent in the
+database and in total, and logs it. With `SERVER_TIMING_ENABLED` off the
+middleware is not loaded and `timed` only looks up a context variable.
+"""
+import contextvars
+import functools
+import inspect
+import logging
+import time
+from typing import Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from utils.query_observer_utils import observe_queries
+
+logger = logging.getLogger(__name__)
+
+
+class PhaseTimer:
+    """The time spent per phase in one request, in seconds."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    def add(self, phase: str, duration: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + duration
+
+    def add_query(self, sql: str, duration: float) -> None:
+        # Used as a query observer for the "db" phase.
+        self.add("db", duration)
+
+
+_current_timer: contextvars.ContextVar[Optional[PhaseTimer]] = contextvars.ContextVar(
+    "phase_timer", default=None
+)
+
+
+class timed:
+    """Add the time spent in the block, or in the decorated function, to
+    `phase` of the current request."""
+
+    __slots__ = ("phase", "timer", "start")
+
+    def __init__(self, phase: str) -> None:
+        self.phase = phase
+
+    def __enter__(self) -> None:
+        self.timer = _current_timer.get()
+        if self.timer is not None:
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        if self.timer is not None:
+            self.timer.add(self.phase, time.perf_counter() - self.start)
+
+    def __call__(self, func: Callable) -> Callable:
+        phase = self.phase
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                timer = _current_timer.get()
+                if timer is None:
+                    return await func(*args, **kwargs)
+
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    timer.add(phase, time.perf_counter() - start)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timer = _current_timer.get()
+            if timer is None:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.add(phase, time.perf_counter() - start)
+
+        return wrapper
+
+
+def get_server_timing(phases: dict[str, float]) -> str:
+    return ", ".join(
+        f"{phase};dur={duration * 1000:.3f}" for phase, duration in phases.items()
+    )
+
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.SERVER_TIMING_ENABLED:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timer = PhaseTimer()
+        token = _current_timer.set(timer)
+        start = time.perf_counter()
+
+        try:
+            with observe_queries(timer.add_query):
+                response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+
+        return self.finish(request, response, timer, start)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        timer = PhaseTimer()
+        token = _current_timer.set(timer)
+        start = time.perf_counter()
+
+        try:
+            with observe_queries(timer.add_query):
+                response = await self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+
+        return self.finish(request, response, timer, start)
+
+    def finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        timer: PhaseTimer,
+        start: float,
+    ) -> HttpResponse:
+        timer.add("total", time.perf_counter() - start)
+        response["Server-Timing"] = get_server_timing(timer.phases)
+
+        resolver_match = getattr(request, "resolver_match", None)
+        logger.info(
+            "%s %s: %s",
+            request.method,
+            request.path,
+            response["Server-Timing"],
+            extra={
+                "view_name": resolver_match.view_name if resolver_match else None,
+                "method": request.method,
+                "status_code": response.status_code,
+                "phases_ms": {
+                    phase: round(duration * 1000, 3)
+                    for phase, duration in timer.phases.items()
+                },
+            },
+        )
+
+        return response